@@ -0,0 +1,133 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.generate import generate_database
+
+# Load test for the JSON API (taskmaster.api). The server runs in its own
+# process on a seeded SQLite file, as it would next to the UI; the client
+# keeps --connections keep-alive connections busy for --seconds per
+# scenario and reports requests/s with p50/p99 latency. Exits non-zero when
+# the stats endpoint serves fewer than --target requests/s.
+# Usage: python benchmarks/bench_api.py [--tasks 10000] [--connections 32] [--seconds 3] [--target 3000]
+
+BATCH = 100
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def read_response(reader):
+    # Status and body of one HTTP/1.1 response, Content-Length or chunked
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line == b'\r\n':
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    if headers.get('transfer-encoding') == 'chunked':
+        parts = []
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            parts.append(await reader.readexactly(size + 2))
+            if not size:
+                return status, b''.join(part[:-2] for part in parts)
+    return status, await reader.readexactly(int(headers['content-length']))
+
+def encode(method, path, payload=None, keep_alive=True):
+    body = json.dumps(payload).encode() if payload is not None else b''
+    connection = "keep-alive" if keep_alive else "close"
+    return f"{method} {path} HTTP/1.1\r\nHost: bench\r\nConnection: {connection}\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+
+async def worker(port, make_request, deadline, latencies, keep_alive):
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        if reader is None:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        start = time.perf_counter()
+        writer.write(make_request(keep_alive))
+        status, _ = await read_response(reader)
+        latencies.append(time.perf_counter() - start)
+        if status >= 400:
+            raise RuntimeError(f"HTTP {status}")
+        if not keep_alive:
+            writer.close()
+            reader = None
+    if reader is not None:
+        writer.close()
+
+async def run_scenario(port, make_request, connections, seconds, keep_alive=True):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(port, make_request, start + seconds, latencies, keep_alive) for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return len(latencies) / elapsed, statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.99)] * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the TaskMaster JSON API")
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--target", type=float, default=3000, help="minimum stats requests/s")
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "api.db")
+        username = generate_database(db_path, 1, args.tasks)[0]
+        port = free_port()
+        server = subprocess.Popen([sys.executable, "-m", "taskmaster.api", "--port", str(port), "--db", db_path],
+                                  cwd=ROOT, stdout=subprocess.DEVNULL)
+        try:
+            base = f"http://127.0.0.1:{port}"
+            for _ in range(100):
+                try:
+                    urllib.request.urlopen(f"{base}/health")
+                    break
+                except OSError:
+                    time.sleep(0.1)
+            with urllib.request.urlopen(f"{base}/users/{username}/tasks?limit={args.tasks}") as response:
+                task_ids = [task['id'] for task in json.load(response)['tasks']]
+            due = time.strftime("%Y-%m-%d")
+            scenarios = [
+                ("stats", lambda keep_alive: encode("GET", f"/users/{username}/stats", keep_alive=keep_alive), True),
+                ("stats, new connection each", lambda keep_alive: encode("GET", f"/users/{username}/stats", keep_alive=keep_alive), False),
+                ("list 100, sorted by due date", lambda keep_alive: encode("GET", f"/users/{username}/tasks?sort=due_date&offset={rng.randrange(args.tasks - 100)}"), True),
+                ("list 5,000, streamed", lambda keep_alive: encode("GET", f"/users/{username}/tasks?limit=5000"), True),
+                (f"create {BATCH}", lambda keep_alive: encode("POST", f"/users/{username}/tasks", {'tasks': [
+                    {'title': f"Synced event {n}", 'due_date': due, 'priority': 'HIGH'} for n in range(BATCH)]}), True),
+                (f"complete {BATCH}", lambda keep_alive: encode("POST", f"/users/{username}/tasks/complete", {'ids': rng.sample(task_ids, BATCH)}), True),
+            ]
+            print(f"{args.connections} connections, {args.seconds:g} s per scenario, user with {args.tasks:,} tasks")
+            results = {}
+            for name, make_request, keep_alive in scenarios:
+                rps, p50, p99 = asyncio.run(run_scenario(port, make_request, args.connections, args.seconds, keep_alive))
+                results[name] = rps
+                print(f"{name:>30}: {rps:8,.0f} req/s   p50 {p50:6.1f} ms   p99 {p99:6.1f} ms")
+        finally:
+            server.terminate()
+            server.wait()
+    if results["stats"] < args.target:
+        print(f"BELOW TARGET: stats served {results['stats']:,.0f} req/s, target {args.target:,.0f}")
+        return 1
+    print(f"stats meets the {args.target:,.0f} req/s target")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generate import build_vocabulary, generate_tasks
+from taskmaster import TaskManager, TaskPriority, TaskStore
+
+# Bulk actions: N tasks completed, reprioritized, rescheduled or deleted one
+# call at a time (one storage commit and index update each, as N clicks would
+# do) against one batched User call, on a user persisted to a SQLite file.
+# Usage: python benchmarks/bench_bulk.py [tasks] [selected]
+
+def seeded_user(directory, name, count, seed):
+    rng = random.Random(seed)
+    manager = TaskManager(TaskStore(os.path.join(directory, f"{name}.db")))
+    manager.register_user(name, f"{name}@example.com")
+    user = manager.login_user(name)
+    user.add_tasks(generate_tasks(count, rng, vocabulary=build_vocabulary(rng)))
+    return user, rng
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    selected = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    today = date.today()
+    actions = {
+        'complete': (lambda user, task_ids: [user.complete_task(task_id) for task_id in task_ids],
+                     lambda user, task_ids: user.complete_tasks(task_ids)),
+        'reprioritize': (lambda user, task_ids: [user.update_tasks([task_id], priority=TaskPriority.URGENT) for task_id in task_ids],
+                         lambda user, task_ids: user.update_tasks(task_ids, priority=TaskPriority.URGENT)),
+        'reschedule': (lambda user, task_ids: [user.update_tasks([task_id], due_date=today + timedelta(days=7)) for task_id in task_ids],
+                       lambda user, task_ids: user.update_tasks(task_ids, due_date=today + timedelta(days=7))),
+        'delete': (lambda user, task_ids: [user.delete_tasks([task_id]) for task_id in task_ids],
+                   lambda user, task_ids: user.delete_tasks(task_ids)),
+    }
+    print(f"{selected} of {count:,} tasks, SQLite file store")
+    with tempfile.TemporaryDirectory() as directory:
+        for action, (one_by_one, batched) in actions.items():
+            timings = []
+            for name, apply in (("single", one_by_one), ("batch", batched)):
+                user, rng = seeded_user(directory, f"{action}_{name}", count, seed=0)
+                task_ids = [user.tasks[i].id for i in rng.sample(range(count), selected)]
+                start = time.perf_counter()
+                apply(user, task_ids)
+                timings.append((time.perf_counter() - start) * 1000)
+                stats = user.get_stats(today)
+                if name == "single":
+                    expected = stats
+                elif stats != expected:
+                    print(f"MISMATCH after {action}: {stats} != {expected}")
+                    return 1
+            print(f"{action:>13}: one at a time {timings[0]:8.1f} ms, batched {timings[1]:7.1f} ms "
+                  f"({timings[0] / timings[1]:.0f}x)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
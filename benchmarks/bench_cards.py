@@ -0,0 +1,120 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Render the Pending and Completed task cards of one synthetic user in an
+# AppTest script, once per task (the old st.markdown-per-card loop) and
+# batched through views.cards, and report script time, delta count and the
+# serialized ForwardMsg bytes that would go over the websocket.
+# Usage: python benchmarks/bench_cards.py [--tasks 10000] [--runs 3]
+
+CARD_SCRIPT = """
+import os, random, sys, time
+from datetime import date
+import streamlit as st
+from streamlit.runtime.scriptrunner_utils.script_run_context import get_script_run_ctx
+
+sys.path.insert(0, os.environ["BENCH_ROOT"])
+from benchmarks.generate import generate_tasks
+from taskmaster import User
+from views.cards import get_card_cache, render_cards
+
+@st.cache_resource
+def bench_user(count):
+    user = User("bench", "bench@example.com")
+    user.add_tasks(generate_tasks(count, random.Random(0)))
+    return user
+
+user = bench_user(int(os.environ["BENCH_TASKS"]))
+ctx = get_script_run_ctx()
+enqueue = ctx._enqueue
+sizes = []
+def counting_enqueue(msg):
+    if msg.WhichOneof("type") == "delta":
+        sizes.append(msg.ByteSize())
+    enqueue(msg)
+ctx._enqueue = counting_enqueue
+
+today = date.today()
+start = time.perf_counter()
+if os.environ["BENCH_MODE"] == "per_task":
+    for task in user.get_completed_tasks():
+        st.markdown(f'''
+        <div class="task-card">
+            <h4>✔️ {task.title}</h4>
+            <p>Completed on: {task.completed_at.strftime('%Y-%m-%d')}</p>
+        </div>
+        ''', unsafe_allow_html=True)
+    today_ordinal = today.toordinal()
+    buckets = user.get_due_buckets(today)
+    for bucket in ('overdue', 'today', 'soon', 'later'):
+        for due_ordinal, _, position in buckets[bucket]:
+            task = user.tasks_at([position])[0]
+            days_left = due_ordinal - today_ordinal
+            if bucket == 'overdue':
+                status = f"❌ Overdue by {-days_left} days"
+            elif bucket == 'today':
+                status = "⚠️ Due today"
+            elif bucket == 'soon':
+                status = f"⚠️ Due in {days_left} days"
+            else:
+                status = f"⏳ Due in {days_left} days"
+            st.markdown(f'''
+            <div class="task-card">
+                <h4>🔘 {task.title}</h4>
+                <p>Priority: {task.priority.name} | Due: {task.due_date.strftime('%Y-%m-%d')} | {status}</p>
+                <p>{task.description}</p>
+            </div>
+            ''', unsafe_allow_html=True)
+else:
+    cache = get_card_cache()
+    render_cards(cache.completed_card(task, today) for task in user.get_completed_tasks())
+    with user.lock:
+        buckets = user.get_due_buckets(today)
+        pending = user.tasks_at(
+            position
+            for bucket in ('overdue', 'today', 'soon', 'later')
+            for _, _, position in buckets[bucket]
+        )
+    render_cards(cache.pending_card(task, today) for task in pending)
+elapsed = (time.perf_counter() - start) * 1000
+ctx._enqueue = enqueue
+st.session_state.result = (elapsed, len(sizes), sum(sizes))
+"""
+
+def main():
+    parser = argparse.ArgumentParser(description="Task card rendering benchmark")
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    from streamlit.testing.v1 import AppTest
+
+    os.environ["BENCH_ROOT"] = ROOT
+    os.environ["BENCH_TASKS"] = str(args.tasks)
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as script:
+        script.write(CARD_SCRIPT)
+    try:
+        print(f"{args.tasks} tasks")
+        print(f"{'mode':<10} {'run':>4} {'script ms':>10} {'deltas':>7} {'payload KB':>11}")
+        for mode in ("per_task", "batched"):
+            os.environ["BENCH_MODE"] = mode
+            app = AppTest.from_file(script.name, default_timeout=600)
+            for run in range(1, args.runs + 1):
+                # Run 1 builds every fragment; later runs hit the memo
+                app.run()
+                if app.exception:
+                    raise RuntimeError(app.exception)
+                elapsed, deltas, payload = app.session_state["result"]
+                print(f"{mode:<10} {run:>4} {elapsed:>10.1f} {deltas:>7} {payload / 1024:>11.1f}")
+    finally:
+        os.unlink(script.name)
+
+if __name__ == "__main__":
+    main()
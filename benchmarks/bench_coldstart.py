@@ -0,0 +1,94 @@
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold-start cost of the Streamlit app, each sample in a fresh interpreter.
+#   - python -X importtime -c "import app": cumulative import time of the entry
+#     script and of the heavy dependencies it drags in
+#   - AppTest time to first paint of the landing page, the first Tasks page
+#     after login, and the first visit to the Analytics page
+# Usage: python benchmarks/bench_coldstart.py [--root path/to/checkout] [--runs 5]
+
+HEAVY_MODULES = ("numpy", "pandas", "plotly.express", "pyarrow")
+IMPORTTIME_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)")
+
+FIRST_PAINT_SCRIPT = """
+import json, os, sys, time
+os.environ["TASKMASTER_DB"] = ":memory:"
+from streamlit.testing.v1 import AppTest
+app_path = os.path.join(sys.argv[1], "app.py")
+heavy = sys.argv[2].split(",")
+loaded = lambda: [name for name in heavy if name in sys.modules]
+results = {}
+start = time.perf_counter()
+at = AppTest.from_file(app_path, default_timeout=120)
+at.run()
+results["landing_ms"] = (time.perf_counter() - start) * 1000
+results["landing_loaded"] = loaded()
+at.sidebar.text_input[0].input("Aqsa")
+start = time.perf_counter()
+at.sidebar.button[0].click().run()
+results["tasks_ms"] = (time.perf_counter() - start) * 1000
+results["tasks_loaded"] = loaded()
+if os.path.exists(os.path.join(sys.argv[1], "views", "analytics.py")):
+    start = time.perf_counter()
+    at.switch_page("views/analytics.py").run()
+    results["analytics_ms"] = (time.perf_counter() - start) * 1000
+    results["analytics_loaded"] = loaded()
+assert not at.exception, at.exception
+print(json.dumps(results))
+"""
+
+def import_times(root):
+    # Cumulative microseconds of the top-level imports under "import app"
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=root, capture_output=True, text=True, check=True,
+    ).stderr
+    times = {}
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            times.setdefault(match.group(3), int(match.group(1)))
+    return times
+
+def first_paint(root):
+    output = subprocess.run(
+        [sys.executable, "-c", FIRST_PAINT_SCRIPT, root, ",".join(HEAVY_MODULES)],
+        cwd=root, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure TaskMaster Pro cold start")
+    parser.add_argument("--root", default=ROOT, help="checkout to measure (default: this one)")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    root = os.path.abspath(args.root)
+
+    imports = [import_times(root) for _ in range(args.runs)]
+    print(f"python -X importtime -c 'import app' in {root} (median of {args.runs}):")
+    print(f"  {'app (total)':<16} {statistics.median(run['app'] for run in imports) / 1000:>8.1f} ms")
+    for name in ("streamlit", "taskmaster") + HEAVY_MODULES:
+        samples = [run[name] for run in imports if name in run]
+        if samples:
+            print(f"  {name:<16} {statistics.median(samples) / 1000:>8.1f} ms")
+        else:
+            print(f"  {name:<16} {'not imported':>11}")
+
+    paints = [first_paint(root) for _ in range(args.runs)]
+    print(f"\nAppTest time to first paint (median of {args.runs}):")
+    for step in ("landing", "tasks", "analytics"):
+        samples = [paint[f"{step}_ms"] for paint in paints if f"{step}_ms" in paint]
+        if samples:
+            loaded = ", ".join(paints[-1][f"{step}_loaded"]) or "none"
+            print(f"  {step:<10} {statistics.median(samples):>8.1f} ms   heavy modules loaded: {loaded}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taskmaster import Task, TaskManager, TaskPriority, TaskStore
+
+# Stress the shared TaskManager the way concurrent Streamlit sessions do.
+#   1. Correctness: many sessions hammer a few shared users with register,
+#      add_task and version-checked complete_task; afterwards every counter,
+#      index and the store must agree with what the sessions were told.
+#   2. Throughput: 1..N sessions, one user each, calling the model back to
+#      back. This is the model's own throughput under the locks and the GIL.
+#      --think-ms adds a second table with a simulated render time (a sleep)
+#      per op; its speedup comes mostly from overlapping the sleeps, not from
+#      the model, and is reported separately for that reason.
+# Usage: python benchmarks/bench_concurrency.py [--sessions 16] [--ops 500] [--think-ms 1]
+
+def session_worker(manager, usernames, ops, seed, results, barrier):
+    rng = random.Random(seed)
+    added = dict.fromkeys(usernames, 0)
+    completed = dict.fromkeys(usernames, 0)
+    rejected = 0
+    barrier.wait()
+    for n in range(ops):
+        username = rng.choice(usernames)
+        # Racing registrations: the account exists, so every attempt must fail
+        if manager.register_user(username, f"{username}@example.com"):
+            results['duplicate_registrations'] += 1
+        user = manager.login_user(username)
+        if rng.random() < 0.6 or not len(user.pending_index):
+            user.add_task(Task(f"task {seed}-{n}", "stress", date.today() + timedelta(days=rng.randint(-5, 30)),
+                               rng.choice(list(TaskPriority))))
+            added[username] += 1
+        else:
+            # Render, then click with the version the list was rendered at
+            version = user.version
+            with user.lock:
+                candidates = user.find_tasks(status='pending')
+                if not len(candidates):
+                    continue
+                task_id = user.tasks_at([candidates[rng.randrange(len(candidates))]])[0].id
+            if user.complete_task(task_id, expected_version=version):
+                completed[username] += 1
+            else:
+                rejected += 1
+    with results['lock']:
+        for username in usernames:
+            results['added'][username] += added[username]
+            results['completed'][username] += completed[username]
+        results['rejected'] += rejected
+
+def check_consistency(sessions, users, ops):
+    store = TaskStore(":memory:")
+    manager = TaskManager(store)
+    usernames = [f"shared{n}" for n in range(users)]
+    for username in usernames:
+        manager.register_user(username, f"{username}@example.com")
+    results = {
+        'lock': threading.Lock(),
+        'added': dict.fromkeys(usernames, 0),
+        'completed': dict.fromkeys(usernames, 0),
+        'rejected': 0,
+        'duplicate_registrations': 0,
+    }
+    barrier = threading.Barrier(sessions)
+    threads = [
+        threading.Thread(target=session_worker, args=(manager, usernames, ops, seed, results, barrier))
+        for seed in range(sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    errors = []
+    if results['duplicate_registrations']:
+        errors.append(f"{results['duplicate_registrations']} duplicate registrations succeeded")
+    for username in usernames:
+        user = manager.login_user(username)
+        user.check_consistency = True
+        try:
+            stats = user.get_stats()
+        except AssertionError as exc:
+            errors.append(str(exc))
+            continue
+        if stats['total_tasks'] != results['added'][username]:
+            errors.append(f"{username}: {stats['total_tasks']} tasks, {results['added'][username]} added (lost updates)")
+        if stats['completed_tasks'] != results['completed'][username]:
+            errors.append(f"{username}: {stats['completed_tasks']} completed, {results['completed'][username]} acknowledged")
+        stored = store.load_user(username).get_stats()
+        if stored != stats:
+            errors.append(f"{username}: store {stored} != memory {stats}")
+    store.close()
+    total_added = sum(results['added'].values())
+    total_completed = sum(results['completed'].values())
+    print(f"{sessions} sessions x {ops} ops on {users} shared users: "
+          f"{total_added} added, {total_completed} completed, {results['rejected']} stale clicks rejected")
+    return errors
+
+def throughput(sessions, ops, think_ms):
+    # Each session owns one user, as in production; think_ms stands in for the
+    # Streamlit script work around each model call, which releases the GIL
+    manager = TaskManager(TaskStore(":memory:"))
+    usernames = [f"user{n}" for n in range(sessions)]
+    for username in usernames:
+        manager.register_user(username, f"{username}@example.com")
+    barrier = threading.Barrier(sessions + 1)
+
+    def run(username):
+        user = manager.login_user(username)
+        barrier.wait()
+        for n in range(ops):
+            if n % 3 == 2:
+                with user.lock:
+                    task_id = user.tasks_at(user.find_tasks(status='pending')[:1])[0].id
+                user.complete_task(task_id, expected_version=user.version)
+            else:
+                user.add_task(Task(f"task {n}", "", date.today(), TaskPriority.MEDIUM))
+            manager.get_user_stats(username)
+            if think_ms:
+                time.sleep(think_ms / 1000)
+
+    threads = [threading.Thread(target=run, args=(username,)) for username in usernames]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    manager.store.close()
+    return sessions * ops / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent session stress test for TaskManager")
+    parser.add_argument("--sessions", type=int, default=16)
+    parser.add_argument("--users", type=int, default=3, help="shared users in the consistency run")
+    parser.add_argument("--ops", type=int, default=500, help="operations per session")
+    parser.add_argument("--think-ms", type=float, default=0.0,
+                        help="also measure with this much simulated render time per op")
+    args = parser.parse_args()
+
+    errors = check_consistency(args.sessions, args.users, args.ops)
+    for error in errors:
+        print(f"  FAIL {error}")
+
+    runs = [(0.0, "model only")]
+    if args.think_ms:
+        runs.append((args.think_ms, f"plus {args.think_ms:g} ms simulated render time per op (sleeps overlap)"))
+    for think_ms, label in runs:
+        print(f"\n{'sessions':>8} {'ops/s':>10} {'speedup':>8}   {label}")
+        baseline = None
+        sessions = 1
+        while sessions <= args.sessions:
+            rate = throughput(sessions, args.ops // 2, think_ms)
+            baseline = baseline or rate
+            print(f"{sessions:>8} {rate:>10.0f} {rate / baseline:>7.1f}x")
+            sessions *= 2
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generate import build_vocabulary, generate_tasks
+from taskmaster import User
+
+# Task ids: lookups through the id index against a scan of the task list,
+# then single deletes by id each followed by get_stats, as every rerun after
+# a click does: tombstoned deletes that readers skip against compacting the
+# list after every delete. Both delete runs must leave the same tasks and
+# the same counts behind.
+# Usage: python benchmarks/bench_ids.py [tasks] [deletes]
+
+def seeded_user(count, seed):
+    rng = random.Random(seed)
+    user = User("bench", "bench@example.com")
+    user.add_tasks(generate_tasks(count, rng, vocabulary=build_vocabulary(rng)))
+    return user, rng
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    deletes = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    user, rng = seeded_user(count, seed=0)
+    task_ids = [task.id for task in rng.sample(user.tasks, 1000)]
+    start = time.perf_counter()
+    found = [user.get_task(task_id) for task_id in task_ids]
+    index_us = (time.perf_counter() - start) / len(task_ids) * 1e6
+    tasks = user.tasks
+    start = time.perf_counter()
+    scanned = [next(task for task in tasks if task.id == task_id) for task_id in task_ids[:50]]
+    scan_us = (time.perf_counter() - start) / 50 * 1e6
+    if found[:50] != scanned:
+        print("MISMATCH: id index and scan disagree")
+        return 1
+    print(f"get_task over {count:,} tasks: {index_us:.2f} us; scanning the list: {scan_us:,.0f} us")
+
+    remaining = []
+    timings = []
+    for compact_each in (True, False):
+        user, rng = seeded_user(count, seed=0)
+        task_ids = [task.id for task in rng.sample(user.tasks, deletes)]
+        start = time.perf_counter()
+        for task_id in task_ids:
+            user.delete_tasks([task_id])
+            if compact_each:
+                with user.lock:
+                    user._compact()
+            stats = user.get_stats()
+        timings.append((time.perf_counter() - start) * 1000)
+        remaining.append(([task.id for task in user.tasks], stats))
+    if remaining[0] != remaining[1] or remaining[1][1]['total_tasks'] != count - deletes:
+        print("MISMATCH: tombstoned and compacted deletes left different tasks")
+        return 1
+    print(f"{deletes:,} single deletes + get_stats: compacting each {timings[0]:,.0f} ms, "
+          f"tombstoned {timings[1]:,.0f} ms ({timings[0] / timings[1]:.0f}x)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.bench_api import free_port
+from taskmaster import TaskManager, TaskStore, analytics, bulk_io
+from taskmaster.api import start_in_thread
+from taskmaster.bulk_io import EXPORT_FIELDS
+from taskmaster.models import User
+
+# Streamed bulk import (taskmaster.bulk_io) of --rows CSV and JSONL rows into
+# a store-backed user, list-backed and TaskTable-backed, reporting rows/s
+# and peak traced memory. It also checks that rows the importer must accept
+# or reject behave the same through a CSV import and through the JSON API's
+# POST /users/{username}/tasks:
+#   - timezone-aware timestamps are stored as naive local time, and the
+#     analytics frame still builds
+#   - malformed JSONL lines and invalid UTF-8 are rejected per row
+# Exits non-zero if a check fails.
+# Usage: python benchmarks/bench_import.py [--rows 100000]
+
+AWARE_ROW = {'title': 'aware', 'due_date': '2024-01-02', 'completed': 'true',
+             'created_at': '2024-01-01T00:00:00+00:00', 'completed_at': '2024-01-01T05:00:00+02:00'}
+
+def encode_rows(rows, fmt):
+    if fmt == 'jsonl':
+        return b''.join(json.dumps(row).encode() + b'\n' for row in rows)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+def sample_rows(count):
+    return [
+        {'id': '', 'title': f"task {n}", 'description': "imported", 'due_date': f"2026-{n % 12 + 1:02d}-{n % 28 + 1:02d}",
+         'priority': ('LOW', 'MEDIUM', 'HIGH', 'URGENT')[n % 4], 'completed': n % 3 == 0,
+         'created_at': '2026-01-01T09:00:00', 'completed_at': '2026-01-02T09:00:00' if n % 3 == 0 else ''}
+        for n in range(count)
+    ]
+
+def new_user(path, username, columnar):
+    # As TASKMASTER_TASK_TABLE=1 would, for this run only
+    User.use_task_table = columnar
+    manager = TaskManager(TaskStore(path))
+    manager.register_user(username, f"{username}@example.com")
+    return manager, manager.login_user(username)
+
+def timed_import(directory, data, fmt, columnar):
+    manager, user = new_user(os.path.join(directory, f"{fmt}-{columnar}.db"), "importer", columnar)
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = bulk_io.import_tasks(user, io.BytesIO(data), fmt)
+    elapsed = time.perf_counter() - start
+    peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    manager.store.close()
+    return result, elapsed, peak_mb
+
+def check_stored(user, label, errors):
+    aware = [task for task in user.tasks if task.title == 'aware']
+    if len(aware) != 1:
+        errors.append(f"{label}: the timezone-aware row was not imported")
+        return
+    task = aware[0]
+    expected = datetime.fromisoformat(AWARE_ROW['created_at']).astimezone().replace(tzinfo=None)
+    if task.created_at != expected or task.completed_at.tzinfo is not None:
+        errors.append(f"{label}: timestamps kept as {task.created_at!r}, {task.completed_at!r}")
+    try:
+        analytics.build_task_frame(user)
+    except (TypeError, ValueError) as exc:
+        errors.append(f"{label}: analytics frame failed after import: {exc}")
+
+def check_csv(columnar, errors):
+    label = f"CSV import ({'TaskTable' if columnar else 'list'})"
+    manager, user = new_user(":memory:", "checker", columnar)
+    data = encode_rows([dict(dict.fromkeys(EXPORT_FIELDS, ''), **AWARE_ROW)], 'csv') + b'\xff\xfe,2024-01-01,,,,,,\n'
+    try:
+        result = bulk_io.import_tasks(user, io.BytesIO(data), 'csv')
+    except Exception as exc:
+        errors.append(f"{label}: import raised {type(exc).__name__}: {exc}")
+        return
+    if result.imported != 1 or [row for row, _ in result.errors] != [2]:
+        errors.append(f"{label}: imported {result.imported}, errors {result.errors}")
+    stored = manager.store.load_user("checker")
+    if len(stored.tasks) != len(user.tasks):
+        errors.append(f"{label}: store has {len(stored.tasks)} tasks, memory {len(user.tasks)}")
+    check_stored(user, label, errors)
+
+def check_jsonl(errors):
+    manager, user = new_user(":memory:", "checker", False)
+    data = encode_rows([AWARE_ROW], 'jsonl') + b'{"title": "broken",\n' + encode_rows([dict(AWARE_ROW, title='ok')], 'jsonl')
+    result = bulk_io.import_tasks(user, io.BytesIO(data), 'jsonl')
+    if result.imported != 2 or [row for row, _ in result.errors] != [2]:
+        errors.append(f"JSONL import: imported {result.imported}, errors {result.errors}")
+
+def check_api(errors):
+    manager, _ = new_user(":memory:", "checker", False)
+    port = free_port()
+    start_in_thread(manager, port=port)
+    request = urllib.request.Request(f"http://127.0.0.1:{port}/users/checker/tasks",
+                                     data=json.dumps({'tasks': [AWARE_ROW]}).encode(), method="POST")
+    try:
+        with urllib.request.urlopen(request) as response:
+            status = response.status
+    except urllib.error.HTTPError as exc:
+        status = exc.code
+    if status != 201:
+        errors.append(f"API create: status {status} for a timezone-aware row")
+        return
+    check_stored(manager.login_user("checker"), "API create", errors)
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import throughput and input checks")
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rows = sample_rows(args.rows)
+    print(f"{'format':<6} {'storage':<9} {'rows/s':>10} {'peak MB':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for fmt in ('csv', 'jsonl'):
+            data = encode_rows(rows, fmt)
+            for columnar in (False, True):
+                result, elapsed, peak_mb = timed_import(directory, data, fmt, columnar)
+                print(f"{fmt:<6} {'TaskTable' if columnar else 'list':<9} {result.imported / elapsed:>10,.0f} {peak_mb:>9.1f}")
+
+    errors = []
+    check_csv(False, errors)
+    check_csv(True, errors)
+    check_jsonl(errors)
+    check_api(errors)
+    for error in errors:
+        print(f"  FAIL {error}")
+    if not errors:
+        print("timezone-aware, malformed and non-UTF-8 rows are handled the same by CSV, JSONL and the API")
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taskmaster import RecurrenceRule, Task, TaskPriority, User
+
+# Recurring tasks: one 10-year daily rule with sparse completions against the
+# same schedule materialized as one Task per day. Compares memory, add cost
+# and the per-rerun reads (stats, Pending tab occurrences), and checks that
+# both agree on the recurring window.
+# Usage: python benchmarks/bench_recurrence.py [years] [rules]
+
+def timed(fn, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+def build(years, rules, today, materialize):
+    start_day = today - timedelta(days=365 * years // 2)
+    days = 365 * years
+    user = User("bench", "bench@example.com")
+    tracemalloc.start()
+    start = time.perf_counter()
+    for r in range(rules):
+        if materialize:
+            tasks = [Task(f"Habit {r}", "", start_day + timedelta(days=n), TaskPriority.MEDIUM) for n in range(days)]
+            user.add_tasks(tasks)
+            # Every 10th day in the past is done
+            for offset in range(0, days // 2, 10):
+                user.complete_task(tasks[offset].id)
+        else:
+            task = Task(f"Habit {r}", "", start_day, TaskPriority.MEDIUM, recurrence=RecurrenceRule('daily'))
+            user.add_task(task)
+            for offset in range(0, days // 2, 10):
+                user.complete_occurrence(task.id, start_day + timedelta(days=offset))
+    build_ms = (time.perf_counter() - start) * 1000
+    peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return user, build_ms, peak_mb
+
+def main():
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    rules = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    today = date.today()
+    print(f"{rules} daily habits over {years} years, every 10th past day completed")
+    results = {}
+    for name, materialize in (("materialized", True), ("recurring", False)):
+        user, build_ms, peak_mb = build(years, rules, today, materialize)
+        stats, stats_ms = timed(lambda: user.get_stats(today))
+        if materialize:
+            pending, pending_ms = timed(lambda: user.get_due_buckets(today))
+        else:
+            pending, pending_ms = timed(lambda: user.get_pending_occurrences(today))
+        results[name] = (user, stats)
+        print(f"{name:>13}: build {build_ms:8.1f} ms, peak {peak_mb:7.1f} MB, "
+              f"get_stats {stats_ms:7.3f} ms, pending {pending_ms:7.3f} ms")
+
+    # Materialized tasks outside the recurring window are not pending work
+    # for the rule, so only completions and the in-window counts must agree
+    materialized, recurring = results["materialized"][0], results["recurring"][0]
+    window_start, window_end = recurring._recurring_window(today)
+    expected_pending = sum(1 for task in materialized.tasks if not task.completed and window_start <= task.due_date < window_end)
+    expected_completed = sum(1 for task in materialized.tasks if task.completed)
+    stats = results["recurring"][1]
+    if (stats['pending_tasks'], stats['completed_tasks']) != (expected_pending, expected_completed):
+        print(f"MISMATCH: {stats} vs pending {expected_pending}, completed {expected_completed}")
+        return 1
+    print("recurring window matches the materialized schedule")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generate import build_vocabulary, generate_tasks
+from taskmaster import TaskManager, TaskPriority
+
+# Team dashboard cost: the event-driven TeamRollups snapshot against a naive
+# rescan of every task of every user, plus the per-mutation overhead of
+# publishing events, and a check that both agree.
+# Usage: python benchmarks/bench_rollups.py [users] [tasks_per_user]
+
+def naive_rollup(manager, today, days=30):
+    completions = Counter()
+    priority_mix = Counter()
+    overdue = total = completed = 0
+    for user in manager.users.values():
+        for task in user.tasks:
+            total += 1
+            priority_mix[task.priority.name] += 1
+            if task.completed:
+                completed += 1
+                completions[task.completed_at.date()] += 1
+            elif task.due_date < today:
+                overdue += 1
+    first_day = today - timedelta(days=days - 1)
+    return {
+        'total_tasks': total,
+        'completed_tasks': completed,
+        'overdue_tasks': overdue,
+        'priority_mix': {priority.name: priority_mix[priority.name] for priority in TaskPriority if priority_mix[priority.name]},
+        'completions_per_day': {first_day + timedelta(days=n): completions[first_day + timedelta(days=n)] for n in range(days)},
+    }
+
+def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    tasks_per_user = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    rng = random.Random(0)
+    vocabulary = build_vocabulary(rng)
+    manager = TaskManager()
+    start = time.perf_counter()
+    for n in range(users):
+        manager.register_user(f"user{n:04d}", f"user{n:04d}@example.com")
+        manager.users[f"user{n:04d}"].add_tasks(generate_tasks(tasks_per_user, rng, vocabulary=vocabulary))
+    print(f"Seeded {users} users x {tasks_per_user} tasks in {time.perf_counter() - start:.1f}s "
+          f"({manager.events.seq} events)")
+
+    today = date.today()
+    user = manager.users["user0000"]
+    with user.lock:
+        pending = [task.id for task in user.tasks_at(user.find_tasks(status='pending')[:500])]
+    start = time.perf_counter()
+    for task_id in pending:
+        user.complete_task(task_id)
+    per_complete = (time.perf_counter() - start) / len(pending) * 1e6
+    print(f"complete_task incl. event publish: {per_complete:.1f} us")
+
+    start = time.perf_counter()
+    snapshot = manager.rollups.snapshot(today)
+    first_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    for _ in range(100):
+        snapshot = manager.rollups.snapshot(today)
+    snapshot_ms = (time.perf_counter() - start) * 10
+    start = time.perf_counter()
+    naive = naive_rollup(manager, today)
+    naive_ms = (time.perf_counter() - start) * 1000
+    print(f"rollup snapshot: {first_ms:.2f} ms first of the day, {snapshot_ms:.3f} ms after; naive rescan: {naive_ms:.1f} ms")
+
+    mismatches = [key for key in naive if naive[key] != snapshot[key]]
+    if mismatches:
+        print(f"MISMATCH in {mismatches}")
+        return 1
+    print("rollups match the rescan")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
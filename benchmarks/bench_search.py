@@ -0,0 +1,49 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generate import generate_tasks
+from taskmaster import User
+
+# Compare the inverted index against a naive substring scan over a large user.
+# Usage: python benchmarks/bench_search.py [task_count]
+
+QUERIES = ["budget", "quarterly review", "pres", "deploy release", "tax", "nonexistent"]
+
+def build_user(task_count, seed=0):
+    user = User("bench", "bench@example.com")
+    user.add_tasks(generate_tasks(task_count, random.Random(seed)))
+    return user
+
+def naive_search(user, query):
+    needle = query.lower()
+    return [
+        i for i, task in enumerate(user.tasks)
+        if needle in task.title.lower() or needle in task.description.lower()
+    ]
+
+def timed(func, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    start = time.perf_counter()
+    user = build_user(task_count)
+    print(f"Built {task_count} tasks in {time.perf_counter() - start:.1f}s")
+    print(f"{'query':<20} {'index ms':>9} {'top50 ms':>9} {'scan ms':>9} {'index hits':>11} {'scan hits':>10}")
+    for query in QUERIES:
+        index_ms, hits = timed(lambda: user.search_index.search(query))
+        top_ms, _ = timed(lambda: user.search_index.search(query, limit=50))
+        scan_ms, scan_hits = timed(lambda: naive_search(user, query), repeat=3)
+        print(f"{query:<20} {index_ms:>9.2f} {top_ms:>9.2f} {scan_ms:>9.2f} {len(hits):>11} {len(scan_hits):>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taskmaster import SubscriptionScheduler, TaskManager, User, add_months
+
+# Subscription sweeps under a fake clock. First the bare scheduler over a
+# million synthetic subscriptions (half of them renewing monthly or
+# annually), stepped a day at a time for 13 months: every sweep must return
+# exactly the subscriptions that ended since the previous one, at a cost that
+# follows the number due rather than the total. Then a TaskManager with real
+# User objects, checked against a rescan after every sweep.
+# Usage: python benchmarks/bench_subscriptions.py [subscriptions] [users]
+
+def bench_scheduler(count, rng, start):
+    ends = {}
+    renewal = {}
+    for n in range(count):
+        username = f"user{n:07d}"
+        ends[username] = start + timedelta(seconds=rng.randrange(365 * 86400))
+        renewal[username] = rng.choice((0, 0, 1, 12))
+    scheduler = SubscriptionScheduler()
+    t = time.perf_counter()
+    scheduler.schedule_many(ends.items())
+    print(f"scheduled {count:,} subscriptions in {(time.perf_counter() - t) * 1000:.0f} ms")
+
+    # Plan changes mid-flight leave stale heap entries behind
+    for username in rng.sample(sorted(ends), count // 20):
+        ends[username] += timedelta(days=30)
+        scheduler.schedule(username, ends[username])
+
+    now = start
+    swept = 0
+    sweep_seconds = 0.0
+    busiest = (0, 0.0)
+    for _ in range(395):
+        previous, now = now, now + timedelta(days=1)
+        t = time.perf_counter()
+        due = scheduler.pop_due(now)
+        for username, end in due:
+            if renewal[username]:
+                ends[username] = add_months(end, renewal[username])
+                scheduler.schedule(username, ends[username])
+            else:
+                del ends[username]
+        elapsed = time.perf_counter() - t
+        sweep_seconds += elapsed
+        swept += len(due)
+        busiest = max(busiest, (len(due), elapsed))
+        for username, end in due:
+            if not previous < end <= now:
+                print(f"MISMATCH: {username} ended {end} but was swept at {now}")
+                return False
+    # Rescan: nothing left in the scheduler may have ended, and it must
+    # hold exactly the subscriptions still running
+    if any(end <= now for end in ends.values()) or len(scheduler) != len(ends):
+        print("MISMATCH: scheduler and rescan disagree after the last sweep")
+        return False
+    t = time.perf_counter()
+    sum(1 for end in ends.values() if end <= now)
+    scan_ms = (time.perf_counter() - t) * 1000
+    print(f"395 daily sweeps: {swept:,} renewals/expiries at {sweep_seconds / swept * 1e6:.1f} us each "
+          f"(busiest: {busiest[0]:,} in {busiest[1] * 1000:.0f} ms)")
+    t = time.perf_counter()
+    for _ in range(1000):
+        scheduler.pop_due(now)
+    print(f"sweep with nothing due: {(time.perf_counter() - t) * 1000:.2f} us; "
+          f"scanning every subscription instead: {scan_ms:.0f} ms")
+    return True
+
+def bench_manager(count, rng, start):
+    manager = TaskManager()
+    for n in range(count):
+        username = f"user{n:06d}"
+        premium = rng.random() < 0.5
+        end = start + timedelta(seconds=rng.randrange(90 * 86400)) if premium else None
+        user = User(username, f"{username}@example.com", premium, end, renewal_months=rng.choice((0, 1)) if premium else 0)
+        user.attach_events(manager.events)
+        user.attach_subscriptions(manager.subscriptions)
+        manager.users[username] = user
+
+    now = start
+    totals = {'renewed': 0, 'expired': 0}
+    for _ in range(120):
+        now += timedelta(days=1)
+        for outcome, n in manager.sweep_subscriptions(now).items():
+            totals[outcome] += n
+        lapsed = [user.username for user in manager.users.values() if user.is_premium and user.subscription_end <= now]
+        premium = sum(1 for user in manager.users.values() if user.is_premium)
+        if lapsed or manager.rollups.snapshot(now.date())['tiers']['premium']['users'] != premium:
+            print(f"MISMATCH on {now:%Y-%m-%d}: {len(lapsed)} lapsed premium users, rollups disagree on the premium count")
+            return False
+    print(f"TaskManager, {count:,} users over 120 days: {totals['renewed']:,} renewed, {totals['expired']:,} expired; "
+          f"every sweep matches a rescan")
+    return True
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    users = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    rng = random.Random(0)
+    start = datetime(2026, 1, 31)
+    if not bench_scheduler(count, rng, start) or not bench_manager(users, rng, start):
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+import argparse
+import gc
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generate import generate_database
+from taskmaster import TaskManager, TaskStore
+from taskmaster.user_cache import estimate_user_bytes
+
+# Many idle tabs, few active ones. Every user logs in once (one idle tab
+# each), then --reruns reruns go 90% to a small active set and 10% to idle
+# users coming back. This is run once with an unbounded user cache and once
+# with --budget MB.
+#
+# Per run it reports:
+#   - traced memory after the run
+#   - rerun latency for cached users and for users reloaded after eviction
+#   - the cache counters
+#
+# It also checks that:
+#   - both runs agree on every stats read and on the team rollups
+#   - a user evicted while still referenced comes back as the same object
+#   - the per-user size estimate is close to tracemalloc
+#
+# Usage: python benchmarks/bench_user_cache.py [users] [tasks_per_user] [--budget 32] [--reruns 5000]
+
+def simulate(db_path, usernames, budget_mb, reruns, seed):
+    rng = random.Random(seed)
+    today = date.today()
+    gc.collect()
+    tracemalloc.start()
+    manager = TaskManager(TaskStore(db_path), cache_budget_mb=budget_mb)
+    for username in usernames:
+        manager.login_user(username)
+    active = usernames[:len(usernames) // 20 or 1]
+    seen = []
+    timings = {'hit': [], 'reload': []}
+    for step in range(reruns):
+        username = rng.choice(active) if rng.random() < 0.9 else rng.choice(usernames)
+        cached = username in manager.users
+        start = time.perf_counter()
+        user = manager.login_user(username)
+        stats = user.get_stats(today)
+        user.get_next_up()
+        if step % 10 == 0:
+            with user.lock:
+                pending = user.tasks_at(user.find_tasks('pending')[:1])
+            if pending:
+                user.complete_task(pending[0].id)
+        timings['hit' if cached else 'reload'].append(time.perf_counter() - start)
+        seen.append(stats)
+        del user
+    gc.collect()
+    traced_mb = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+    return manager, seen, traced_mb, timings
+
+def check_revival(manager, usernames):
+    # Hold one user, push it out of the cache by touching everyone else,
+    # and look it up again: it must be the same object, not a second copy
+    held = manager.login_user(usernames[-1])
+    for username in usernames[:-1]:
+        manager.login_user(username)
+    evicted = usernames[-1] not in manager.users
+    return evicted and manager.login_user(usernames[-1]) is held
+
+def check_estimate(db_path, username):
+    store = TaskStore(db_path)
+    gc.collect()
+    tracemalloc.start()
+    user = store.load_user(username)
+    user.get_stats()
+    traced = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return estimate_user_bytes(user), traced
+
+def mean_ms(samples):
+    return sum(samples) / len(samples) * 1000 if samples else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory and hit rate of the bounded user cache")
+    parser.add_argument("users", type=int, nargs="?", default=2_000)
+    parser.add_argument("tasks_per_user", type=int, nargs="?", default=100)
+    parser.add_argument("--budget", type=float, default=32, help="user cache budget in MB")
+    parser.add_argument("--reruns", type=int, default=5_000)
+    args = parser.parse_args()
+    users, tasks_per_user, budget_mb, reruns = args.users, args.tasks_per_user, args.budget, args.reruns
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "cache.db")
+        usernames = generate_database(db_path, users, tasks_per_user)
+        print(f"{users:,} users x {tasks_per_user} tasks, {reruns:,} reruns (90% on {len(usernames) // 20} active users)")
+        runs = {}
+        for name, budget in (("unbounded", 0), (f"{budget_mb:g} MB budget", budget_mb)):
+            # Each run writes completions, so each gets its own copy
+            run_path = os.path.join(directory, f"{budget:g}.db")
+            shutil.copy(db_path, run_path)
+            manager, seen, traced_mb, timings = simulate(run_path, usernames, budget, reruns, seed=1)
+            runs[name] = (manager, seen)
+            cache = manager.users.stats()
+            print(f"{name:>16}: {traced_mb:7.1f} MB traced, {cache['users']:,} users cached "
+                  f"(est. {cache['estimated_mb']:g} MB); rerun {mean_ms(timings['hit']):.2f} ms cached, "
+                  f"{mean_ms(timings['reload']):.1f} ms reloaded; hit rate {cache['hit_rate']:.1%}, "
+                  f"{cache['misses']:,} misses, {cache['evictions']:,} evictions")
+        (unbounded, unbounded_seen), (bounded, bounded_seen) = runs.values()
+        if unbounded_seen != bounded_seen:
+            print("MISMATCH: reloaded users returned different stats")
+            return 1
+        if unbounded.rollups.snapshot() != bounded.rollups.snapshot():
+            print("MISMATCH: eviction and reload changed the team rollups")
+            return 1
+        if not check_revival(bounded, usernames):
+            print("MISMATCH: a user evicted while referenced was loaded twice")
+            return 1
+        estimated, traced = check_estimate(db_path, usernames[0])
+        print(f"size estimate for one user: {estimated / 1024:.0f} KiB estimated, {traced / 1024:.0f} KiB traced")
+        print("stats and rollups match with and without eviction; referenced users are revived, not reloaded")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
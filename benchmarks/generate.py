@@ -0,0 +1,98 @@
+import argparse
+import itertools
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taskmaster import Task, TaskPriority, TaskStore
+
+# ======================
+# SYNTHETIC DATA GENERATOR
+# ======================
+
+WORDS = (
+    "project report meeting review budget groceries exercise call email invoice "
+    "design deploy release bugfix planning presentation flights dentist taxes "
+    "garden laundry research interview onboarding backup migration quarterly"
+).split()
+PRIORITY_WEIGHTS = {
+    TaskPriority.LOW: 0.3,
+    TaskPriority.MEDIUM: 0.4,
+    TaskPriority.HIGH: 0.2,
+    TaskPriority.URGENT: 0.1,
+}
+PREMIUM_SHARE = 0.2
+INSERT_BATCH = 10_000
+
+def build_vocabulary(rng, size=5000):
+    # Common task words plus a long tail of made-up ones, drawn Zipf-like so a
+    # few terms are frequent and most are rare
+    syllables = ["ka", "lo", "mi", "ren", "to", "sa", "vel", "dor", "qui", "na", "pe", "zu"]
+    tail = {"".join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(size)}
+    vocabulary = WORDS + sorted(tail)
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+    return vocabulary, cum_weights
+
+def generate_tasks(count, rng, now=None, vocabulary=None):
+    # Tasks created over the past year (mostly recently), due about two weeks
+    # after creation; overdue tasks are mostly done, future ones mostly open
+    now = now or datetime.now()
+    vocabulary, cum_weights = vocabulary or build_vocabulary(rng)
+    priorities = list(PRIORITY_WEIGHTS)
+    priority_weights = list(PRIORITY_WEIGHTS.values())
+    for i in range(count):
+        created_at = now - timedelta(days=min(rng.expovariate(1 / 60), 365), seconds=rng.randint(0, 86399))
+        due_date = (created_at + timedelta(days=max(0, int(rng.gauss(14, 10))))).date()
+        completed = rng.random() < (0.85 if due_date < now.date() else 0.15)
+        task = Task(
+            " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=3)),
+            " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=8)),
+            due_date,
+            rng.choices(priorities, priority_weights)[0],
+            completed,
+        )
+        task.created_at = created_at
+        if completed:
+            lead_time = (datetime.combine(due_date, datetime.min.time()) - created_at) * rng.uniform(0.2, 1.3)
+            task.completed_at = min(created_at + max(lead_time, timedelta(minutes=5)), now)
+        yield task
+
+def generate_database(path, users, tasks_per_user, seed=0):
+    # Seed users user0000..userNNNN with tasks_per_user tasks each; returns the usernames
+    rng = random.Random(seed)
+    vocabulary = build_vocabulary(rng)
+    store = TaskStore(path)
+    usernames = []
+    try:
+        for n in range(users):
+            username = f"user{n:04d}"
+            usernames.append(username)
+            with store.transaction():
+                store.insert_user(username, f"{username}@example.com")
+                if rng.random() < PREMIUM_SHARE:
+                    store.update_subscription(username, True, datetime.now() + timedelta(days=rng.randint(1, 365)))
+            tasks = generate_tasks(tasks_per_user, rng, vocabulary=vocabulary)
+            while True:
+                batch = list(itertools.islice(tasks, INSERT_BATCH))
+                if not batch:
+                    break
+                store.insert_tasks(username, batch)
+    finally:
+        store.close()
+    return usernames
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a TaskMaster SQLite database with synthetic users and tasks")
+    parser.add_argument("path", help="SQLite file to create or extend")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--tasks", type=int, default=1000, help="tasks per user")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    usernames = generate_database(args.path, args.users, args.tasks, args.seed)
+    print(f"Wrote {len(usernames)} users x {args.tasks} tasks to {args.path}")
+
+if __name__ == "__main__":
+    main()
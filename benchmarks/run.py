@@ -0,0 +1,209 @@
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.generate import generate_database
+from taskmaster import TaskManager, TaskStore, User, analytics
+
+# ======================
+# BENCHMARK HARNESS
+# ======================
+#
+# Seeds one user per size, then measures
+#   - the model calls on their own (cold load, get_user_stats, get_pending_tasks,
+#     analytics frame construction),
+#   - the memory a loaded user keeps, with its tasks in a list and in a
+#     TaskTable (TASKMASTER_TASK_TABLE=1); for these rows the MB columns are
+#     what the user retains once loaded rather than the peak while loading, and
+#   - full headless reruns of app.py with streamlit.testing's AppTest for each
+#     task tab and the Analytics page.
+# Wall time is the median over --repeat runs; peak memory comes from one extra
+# run under tracemalloc. Results are compared against thresholds.json and the
+# script exits non-zero when any tracked metric is over its limit.
+#
+#   python benchmarks/run.py                      # 1k, 10k and 100k tasks
+#   python benchmarks/run.py --sizes 1000 --repeat 3
+#   python benchmarks/run.py --write-thresholds   # record current results x headroom
+
+APP_PATH = os.path.join(ROOT, "app.py")
+THRESHOLDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thresholds.json")
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+TABS = ["📋 All Tasks", "✅ Completed", "⏳ Pending"]
+ANALYTICS_PAGE = "views/analytics.py"
+HEADROOM = 2.0
+# Floors keep sub-millisecond / near-zero results from tripping on noise
+MIN_THRESHOLDS = {"wall_ms": 1.0, "peak_mb": 0.1}
+
+def measure(func, repeat):
+    # Median wall time in ms over repeat runs, then peak traced memory in MB
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return statistics.median(timings), peak / 1e6
+
+def measure_retained(build, repeat):
+    # Median wall time in ms of build(), then the traced memory in MB its
+    # result holds: what is released when the result is dropped, so that
+    # interpreter tables that only grew meanwhile are not counted
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        build()
+        timings.append((time.perf_counter() - start) * 1000)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        built = build()
+        gc.collect()
+        held = tracemalloc.get_traced_memory()[0]
+        del built
+        gc.collect()
+        retained = held - tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return statistics.median(timings), retained / 1e6
+
+def load_user_as(store, username, columnar):
+    # As TASKMASTER_TASK_TABLE=1 (or unset) would, for this load only
+    previous = User.use_task_table
+    User.use_task_table = columnar
+    try:
+        return store.load_user(username)
+    finally:
+        User.use_task_table = previous
+
+def bench_model(db_path, username, repeat):
+    store = TaskStore(db_path)
+    results = {}
+    try:
+        results["load_user"] = measure(lambda: store.load_user(username), repeat)
+        manager = TaskManager(store)
+        user = manager.login_user(username)
+        results["get_user_stats"] = measure(lambda: manager.get_user_stats(username), repeat)
+        results["get_pending_tasks"] = measure(user.get_pending_tasks, repeat)
+        results["build_task_frame"] = measure(lambda: analytics.build_task_frame(user), repeat)
+        for storage, columnar in (("list", False), ("TaskTable", True)):
+            results[f"user memory {storage}"] = measure_retained(lambda: load_user_as(store, username, columnar), repeat)
+    finally:
+        store.close()
+    return results
+
+def bench_app(db_path, username, repeat):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    # The app opens its database through st.cache_resource; point it at this size
+    os.environ["TASKMASTER_DB"] = db_path
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    app = AppTest.from_file(APP_PATH, default_timeout=600)
+    app.run()
+    app.sidebar.text_input[0].input(username)
+    app.sidebar.button[0].click().run()
+    if app.exception:
+        raise RuntimeError(f"login failed: {app.exception}")
+    results = {}
+    for tab in TABS:
+        def rerun():
+            # AppTest does not echo tab selection back, so select it before every run
+            app.session_state["task_tabs"] = tab
+            app.run()
+            if app.exception:
+                raise RuntimeError(f"{tab} rerun failed: {app.exception}")
+
+        rerun()  # warm caches for this tab
+        results[f"tab {tab.split(' ', 1)[1]}"] = measure(rerun, repeat)
+
+    def rerun_analytics():
+        app.switch_page(ANALYTICS_PAGE).run()
+        if app.exception:
+            raise RuntimeError(f"Analytics rerun failed: {app.exception}")
+
+    rerun_analytics()
+    results["page Analytics"] = measure(rerun_analytics, repeat)
+    return results
+
+def load_thresholds():
+    if not os.path.exists(THRESHOLDS_PATH):
+        return {}
+    with open(THRESHOLDS_PATH) as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description="TaskMaster Pro benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="tasks per user to benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-app", action="store_true", help="only benchmark the model layer")
+    parser.add_argument("--write-thresholds", action="store_true",
+                        help=f"store current results x{HEADROOM} as the regression thresholds")
+    args = parser.parse_args()
+
+    thresholds = load_thresholds()
+    measured = {}
+    failures = []
+    print(f"{'benchmark':<32} {'size':>7} {'wall ms':>10} {'peak MB':>9} {'limit ms':>10} {'limit MB':>9}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            db_path = os.path.join(workdir, f"bench_{size}.db")
+            username = generate_database(db_path, users=1, tasks_per_user=size)[0]
+            results = {f"model {name}": value for name, value in bench_model(db_path, username, args.repeat).items()}
+            if not args.skip_app:
+                results.update({f"app {name}": value for name, value in bench_app(db_path, username, args.repeat).items()})
+            for name, (wall_ms, peak_mb) in results.items():
+                key = f"{name}@{size}"
+                measured[key] = {"wall_ms": round(wall_ms, 2), "peak_mb": round(peak_mb, 2)}
+                limit = thresholds.get(key, {})
+                over = [
+                    metric for metric, value in (("wall_ms", wall_ms), ("peak_mb", peak_mb))
+                    if metric in limit and value > limit[metric]
+                ]
+                if over:
+                    failures.append((key, over))
+                print(
+                    f"{name:<32} {size:>7} {wall_ms:>10.2f} {peak_mb:>9.2f} "
+                    f"{limit.get('wall_ms', float('nan')):>10.2f} {limit.get('peak_mb', float('nan')):>9.2f}"
+                    + ("  REGRESSION" if over else "")
+                )
+            if results["model user memory TaskTable"][1] >= results["model user memory list"][1]:
+                print(f"{'':<32} {size:>7} TaskTable user holds no less memory than the list user  REGRESSION")
+                failures.append((f"model user memory TaskTable@{size}", ["peak_mb not below list"]))
+
+    if args.write_thresholds:
+        thresholds.update({
+            key: {metric: round(max(value * HEADROOM, MIN_THRESHOLDS[metric]), 2) for metric, value in values.items()}
+            for key, values in measured.items()
+        })
+        with open(THRESHOLDS_PATH, "w") as f:
+            json.dump(thresholds, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Wrote {len(measured)} thresholds to {THRESHOLDS_PATH}")
+        return 0
+    if failures:
+        print(f"\n{len(failures)} benchmark(s) exceeded their threshold:")
+        for key, metrics in failures:
+            print(f"  {key}: {', '.join(metrics)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
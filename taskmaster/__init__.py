@@ -0,0 +1,14 @@
+from .models import Task, TaskManager, TaskPriority, User, add_months
+from .recurrence import Occurrence, RecurrenceRule
+from .storage import DatabaseSimulator, TaskStore
+from .subscriptions import SubscriptionScheduler
+from .user_cache import UserCache
+
+# The columnar TaskTable needs NumPy; import it only when it is asked for
+_TASK_TABLE_EXPORTS = ('TaskSelection', 'TaskTable', 'TaskView')
+
+def __getattr__(name):
+    if name in _TASK_TABLE_EXPORTS:
+        from . import task_table
+        return getattr(task_table, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
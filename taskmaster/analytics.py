@@ -0,0 +1,128 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from .models import TaskPriority
+from .profiling import profiled
+
+# ======================
+# ANALYTICS PIPELINE
+# ======================
+
+PRIORITY_NAMES = [priority.name for priority in TaskPriority]
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+COLUMN_DTYPES = {
+    'Title': object,
+    'Priority': np.int8,
+    'Due Date': np.int64,
+    'Completed': np.bool_,
+    'Created At': 'datetime64[us]',
+    'Completed At': 'datetime64[us]',
+}
+
+def _columns_from_table(table):
+    # TaskTable columns map straight onto NumPy/pandas dtypes; the int64 timestamp
+    # sentinel is numpy's NaT, so it can be reinterpreted without a copy loop
+    return {
+        'Title': table.titles[:len(table)],
+        'Priority': table.column('priorities'),
+        'Due Date': table.column('due_days'),
+        'Completed': table.column('completed'),
+        'Created At': table.column('created_at').view('datetime64[us]'),
+        'Completed At': table.column('completed_at').view('datetime64[us]'),
+    }
+
+def _columns_from_tasks(tasks):
+    # One pass over the Task objects, no per-row dicts
+    if not tasks:
+        return {name: [] for name in ('Title', 'Priority', 'Due Date', 'Completed', 'Created At', 'Completed At')}
+    titles, priorities, due_days, completed, created_at, completed_at = zip(*(
+        (task.title, task.priority, task.due_date.toordinal(), task.completed, task.created_at, task.completed_at)
+        for task in tasks
+    ))
+    # Enum.value is a descriptor call per row; compare the members vectorized instead
+    priorities = np.array(priorities, dtype=object)
+    priority_codes = np.zeros(len(priorities), dtype=np.int8)
+    for priority in TaskPriority:
+        priority_codes[priorities == priority] = priority.value
+    return {
+        'Title': titles,
+        'Priority': priority_codes,
+        'Due Date': due_days,
+        'Completed': completed,
+        'Created At': pd.Series(created_at, dtype='datetime64[us]'),
+        'Completed At': pd.Series(completed_at, dtype='datetime64[us]'),
+    }
+
+@profiled('analytics.build_task_frame')
+def build_task_frame(user, today=None):
+    today = today or date.today()
+    # user.tasks is a snapshot of the live tasks, taken under the user's lock
+    tasks = user.tasks
+    if user.columnar:
+        columns = _columns_from_table(tasks)
+    else:
+        columns = _columns_from_tasks(tasks)
+    if user.recurring_tasks:
+        # One row per completed occurrence and per open one in the recurring window
+        occurrence_columns = _columns_from_tasks(user.get_analytics_occurrences(today))
+        columns = {
+            name: np.concatenate([np.asarray(columns[name], dtype=dtype), np.asarray(occurrence_columns[name], dtype=dtype)])
+            for name, dtype in COLUMN_DTYPES.items()
+        }
+    df = pd.DataFrame({
+        'Title': pd.Series(columns['Title'], dtype=object),
+        'Priority': pd.Categorical.from_codes(np.asarray(columns['Priority'], dtype=np.int8) - 1, PRIORITY_NAMES),
+        # Due dates arrive as day ordinals from either source
+        'Due Date': pd.to_datetime((np.asarray(columns['Due Date'], dtype=np.int64) - EPOCH_ORDINAL).astype('datetime64[D]')),
+        'Completed': np.asarray(columns['Completed'], dtype=np.bool_),
+        'Created At': np.asarray(columns['Created At'], dtype='datetime64[us]'),
+        'Completed At': np.asarray(columns['Completed At'], dtype='datetime64[us]'),
+    })
+    days_left = (df['Due Date'] - pd.Timestamp(today)).dt.days
+    df['Days Left'] = days_left.where(~df['Completed'])
+    lead_time = df['Completed At'] - df['Created At']
+    df['Completion Time'] = lead_time.dt.days
+    df['Lead Time (days)'] = lead_time.dt.total_seconds() / 86400
+    return df
+
+# ======================
+# CHARTS
+# ======================
+
+def completion_rate_figure(completed_count, pending_count):
+    return px.pie(
+        names=['Completed', 'Pending'],
+        values=[completed_count, pending_count],
+        title='Task Completion Rate',
+        color=['Completed', 'Pending'],
+        color_discrete_map={'Completed':'#2ecc71','Pending':'#e74c3c'}
+    )
+
+def priority_distribution_figure(df):
+    priority_counts = df['Priority'].value_counts(sort=False).reset_index()
+    priority_counts.columns = ['Priority', 'Count']
+    return px.bar(
+        priority_counts,
+        x='Priority',
+        y='Count',
+        title='Task Priority Distribution',
+        color='Priority'
+    )
+
+def weekly_completions_figure(df):
+    completed_at = df.loc[df['Completed'], 'Completed At'].dropna()
+    weekly = completed_at.dt.to_period('W').dt.start_time.value_counts().sort_index().reset_index()
+    weekly.columns = ['Week', 'Completed']
+    return px.bar(weekly, x='Week', y='Completed', title='Completions per Week')
+
+def lead_time_figure(df):
+    lead_times = df.loc[df['Completed'], ['Lead Time (days)']].dropna()
+    return px.histogram(
+        lead_times,
+        x='Lead Time (days)',
+        nbins=30,
+        title='Lead Time Distribution (created → completed)'
+    )
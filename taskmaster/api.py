@@ -0,0 +1,364 @@
+import argparse
+import asyncio
+import hmac
+import json
+import os
+import threading
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .bulk_io import _export_record, parse_task_row
+from .models import TaskPriority
+
+# ======================
+# HEADLESS JSON API
+# ======================
+#
+# A small HTTP/1.1 JSON service for integrations and scripts, served on an
+# asyncio event loop next to the Streamlit UI and sharing its TaskManager,
+# so both see the same User objects, locks and caches:
+#
+#   GET  /health
+#   GET  /users/{username}/stats
+#   GET  /users/{username}/tasks?status=&priority=&sort=&q=&offset=&limit=
+#   POST /users/{username}/tasks            {"tasks": [{"title": ..., "due_date": ...}, ...]}
+#   POST /users/{username}/tasks/complete   {"ids": [...], "expected_version": n}
+#
+# Connections are kept alive between requests (HTTP/1.1 default) and
+# listing pages above STREAM_CHUNK tasks are sent with chunked transfer
+# encoding, one chunk of records at a time. Nothing that can block runs on
+# the loop: user lookups (which take a TaskManager lock and may load from
+# the store), reads (which take the user's lock and sort under it) and
+# writes (which also commit to SQLite) all run in the loop's default
+# executor, so one busy account does not stall other connections.
+#
+#   TASKMASTER_API_PORT=8765 streamlit run app.py       # next to the UI
+#   python -m taskmaster.api --db api.db --port 8765   # standalone
+#
+# A standalone server has its own TaskManager, whose cached users and
+# rollups would silently diverge from a running app's, so it needs its own
+# database and refuses the app's.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 10_000
+# Listing pages larger than this are streamed, this many records per chunk
+STREAM_CHUNK = 500
+MAX_BATCH = 10_000
+MAX_BODY_BYTES = 8 * 2**20
+MAX_HEADERS = 100
+# Idle keep-alive connections are closed after this many seconds
+KEEP_ALIVE_TIMEOUT = 15
+SORT_KEYS = ('due_date', 'priority')
+STATUSES = ('pending', 'completed')
+REASONS = {
+    200: "OK", 201: "Created", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+    405: "Method Not Allowed", 409: "Conflict", 411: "Length Required", 413: "Payload Too Large",
+    422: "Unprocessable Entity", 431: "Request Header Fields Too Large", 500: "Internal Server Error",
+}
+
+def _dumps(payload):
+    return json.dumps(payload, separators=(',', ':')).encode()
+
+class APIError(Exception):
+    # Raised by handlers; becomes a JSON {"error": ...} response with this status
+    def __init__(self, status, message, **details):
+        super().__init__(message)
+        self.status = status
+        self.payload = {'error': message, **details}
+
+class TaskAPI:
+    def __init__(self, task_manager, token=None):
+        self.task_manager = task_manager
+        # Optional shared secret: every request but /health must send
+        # "Authorization: Bearer <token>"
+        self.token = token
+        self.server = None
+        self.port = None
+        self.loop = None
+        self.routes = {
+            ('GET', 'stats'): self.get_stats,
+            ('GET', 'tasks'): self.list_tasks,
+            ('POST', 'tasks'): self.create_tasks,
+            ('POST', 'tasks/complete'): self.complete_tasks,
+        }
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.loop = asyncio.get_running_loop()
+        self.server = await asyncio.start_server(self._serve_connection, host, port, backlog=1024)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        await self.start(host, port)
+        async with self.server:
+            await self.server.serve_forever()
+
+    def stop(self):
+        # Thread-safe: closes the listening socket on the API's own loop
+        if self.server is not None:
+            self.loop.call_soon_threadsafe(self.server.close)
+
+    # ----------------------
+    # HTTP/1.1 connection handling
+    # ----------------------
+
+    async def _serve_connection(self, reader, writer):
+        # One request at a time per connection, in order, until the client
+        # closes it, asks for Connection: close or goes idle
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    method, target, version = line.decode('latin-1').split()
+                    headers = await self._read_headers(reader)
+                    body = await self._read_body(reader, headers)
+                except APIError as exc:
+                    await self._respond(writer, exc.status, exc.payload, version='HTTP/1.0', keep_alive=False)
+                    break
+                except ValueError:
+                    await self._respond(writer, 400, {'error': "malformed request"}, version='HTTP/1.0', keep_alive=False)
+                    break
+                connection = headers.get('connection', '').lower()
+                if version == 'HTTP/1.1':
+                    keep_alive = connection != 'close'
+                else:
+                    keep_alive = connection == 'keep-alive'
+                try:
+                    status, payload = await self._dispatch(method, target, headers, body)
+                except APIError as exc:
+                    status, payload = exc.status, exc.payload
+                except Exception as exc:
+                    status, payload = 500, {'error': f"{type(exc).__name__}: {exc}"}
+                await self._respond(writer, status, payload, version, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_headers(self, reader):
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                return headers
+            if len(headers) >= MAX_HEADERS:
+                raise APIError(431, "too many headers")
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+    async def _read_body(self, reader, headers):
+        if 'transfer-encoding' in headers:
+            raise APIError(411, "send request bodies with Content-Length")
+        length = int(headers.get('content-length', 0))
+        if length > MAX_BODY_BYTES:
+            raise APIError(413, f"request body over {MAX_BODY_BYTES} bytes")
+        return await reader.readexactly(length) if length else b''
+
+    async def _respond(self, writer, status, payload, version, keep_alive):
+        # payload is a JSON-serializable object, or an iterator of byte
+        # chunks that are streamed as they are produced
+        head = f"{version} {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+        head += "Connection: keep-alive\r\n" if keep_alive else "Connection: close\r\n"
+        if isinstance(payload, (dict, list)):
+            body = _dumps(payload)
+            writer.write(f"{head}Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        elif version == 'HTTP/1.1':
+            writer.write(f"{head}Transfer-Encoding: chunked\r\n\r\n".encode())
+            for chunk in payload:
+                writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                # Wait for slow readers instead of buffering the whole listing
+                await writer.drain()
+            writer.write(b"0\r\n\r\n")
+        else:
+            # HTTP/1.0 has no chunked encoding
+            body = b''.join(payload)
+            writer.write(f"{head}Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        await writer.drain()
+
+    # ----------------------
+    # Routing
+    # ----------------------
+
+    async def _dispatch(self, method, target, headers, body):
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip('/').split('/')]
+        if parts == ['health']:
+            return 200, {'status': 'ok', 'user_cache': self.task_manager.users.stats()}
+        if self.token is not None:
+            supplied = headers.get('authorization', '')
+            if not hmac.compare_digest(supplied.encode(), f"Bearer {self.token}".encode()):
+                raise APIError(401, "missing or wrong bearer token")
+        name = '/'.join(parts[2:])
+        handler = self.routes.get((method, name)) if parts[0] == 'users' and len(parts) > 2 else None
+        if handler is None:
+            if parts[0] == 'users' and any(route == name for _, route in self.routes):
+                raise APIError(405, f"{method} not allowed on {url.path}")
+            raise APIError(404, f"no route for {url.path}")
+        user = await self._user(parts[1])
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        return await handler(user, query, self._json(body) if method == 'POST' else None)
+
+    async def _user(self, username):
+        user = await self.loop.run_in_executor(None, self.task_manager.login_user, username)
+        if user is None:
+            raise APIError(404, f"unknown user {username!r}")
+        return user
+
+    def _json(self, body):
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            raise APIError(400, "request body is not valid JSON")
+        if not isinstance(payload, dict):
+            raise APIError(400, "request body must be a JSON object")
+        return payload
+
+    # ----------------------
+    # Handlers
+    # ----------------------
+
+    async def get_stats(self, user, query, payload):
+        stats = await self.loop.run_in_executor(None, self._stats, user)
+        return 200, stats
+
+    def _stats(self, user):
+        # As TaskManager.get_user_stats, on the user already looked up
+        with user.lock:
+            stats = user.get_stats()
+            stats['premium_user'] = user.is_premium
+            stats['version'] = user.version
+        return stats
+
+    async def list_tasks(self, user, query, payload):
+        status = query.get('status')
+        if status is not None and status not in STATUSES:
+            raise APIError(400, f"status must be one of {', '.join(STATUSES)}")
+        sort_by = query.get('sort')
+        if sort_by is not None and sort_by not in SORT_KEYS:
+            raise APIError(400, f"sort must be one of {', '.join(SORT_KEYS)}")
+        try:
+            priority = TaskPriority[query['priority'].upper()] if 'priority' in query else None
+            offset = int(query.get('offset', 0))
+            limit = int(query.get('limit', DEFAULT_PAGE_SIZE))
+        except (KeyError, ValueError):
+            raise APIError(400, "priority must be a priority name; offset and limit must be integers")
+        if offset < 0 or not 0 < limit <= MAX_PAGE_SIZE:
+            raise APIError(400, f"offset must be >= 0 and limit between 1 and {MAX_PAGE_SIZE}")
+        page, total, version = await self.loop.run_in_executor(
+            None, self._select_page, user, query.get('q'), status, priority, sort_by, offset, limit
+        )
+        head = {'total': total, 'offset': offset, 'limit': limit,
+                'next_offset': offset + limit if offset + limit < total else None, 'version': version}
+        if len(page) <= STREAM_CHUNK:
+            head['tasks'] = [_export_record(task) for task in page]
+            return 200, head
+        return 200, self._stream_page(head, page)
+
+    def _select_page(self, user, text, status, priority, sort_by, offset, limit):
+        with user.lock:
+            if text:
+                positions = user.search_tasks(text, status, priority)
+            else:
+                positions = user.find_tasks(status, priority, sort_by)
+            # Resolved in the same locked block as the query (see User.tasks_at)
+            page = user.tasks_at(positions[offset:offset + limit])
+            return page, len(positions), user.version
+
+    def _stream_page(self, head, page):
+        # The same JSON object as an unstreamed page, produced chunk by chunk
+        yield _dumps(head)[:-1] + b',"tasks":['
+        for start in range(0, len(page), STREAM_CHUNK):
+            records = [_export_record(task) for task in page[start:start + STREAM_CHUNK]]
+            chunk = _dumps(records)[1:-1]
+            yield chunk if start == 0 else b',' + chunk
+        yield b']}'
+
+    async def create_tasks(self, user, query, payload):
+        rows = payload.get('tasks')
+        if not isinstance(rows, list) or not rows:
+            raise APIError(400, "expected a non-empty \"tasks\" list")
+        if len(rows) > MAX_BATCH:
+            raise APIError(413, f"at most {MAX_BATCH} tasks per request")
+        # All or nothing: one bad row rejects the batch
+        tasks = []
+        errors = []
+        for index, row in enumerate(rows):
+            try:
+                tasks.append(parse_task_row(row))
+            except (KeyError, ValueError, TypeError, AttributeError) as exc:
+                errors.append({'index': index, 'error': str(exc) or type(exc).__name__})
+        if errors:
+            raise APIError(422, "invalid tasks; none were added", errors=errors)
+        await self.loop.run_in_executor(None, user.add_tasks, tasks)
+        return 201, {'ids': [task.id for task in tasks], 'version': user.version}
+
+    async def complete_tasks(self, user, query, payload):
+        task_ids = payload.get('ids')
+        if not isinstance(task_ids, list) or not all(isinstance(task_id, int) for task_id in task_ids):
+            raise APIError(400, "expected an \"ids\" list of task ids")
+        if len(task_ids) > MAX_BATCH:
+            raise APIError(413, f"at most {MAX_BATCH} ids per request")
+        expected_version = payload.get('expected_version')
+        if expected_version is not None and not isinstance(expected_version, int):
+            raise APIError(400, "expected_version must be an integer")
+        if not await self.loop.run_in_executor(None, user.complete_tasks, task_ids, expected_version):
+            raise APIError(409, "unknown task id or stale expected_version; nothing was completed", version=user.version)
+        return 200, {'completed': len(set(task_ids)), 'version': user.version}
+
+def start_in_thread(task_manager, host=DEFAULT_HOST, port=DEFAULT_PORT, token=None):
+    # Serve the API on its own event loop in a daemon thread, next to the
+    # Streamlit server; returns the TaskAPI once it is listening
+    api = TaskAPI(task_manager, token)
+    started = threading.Event()
+    failure = []
+
+    def run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(api.start(host, port))
+        except OSError as exc:
+            failure.append(exc)
+            return
+        finally:
+            started.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, name="taskmaster-api", daemon=True).start()
+    started.wait()
+    if failure:
+        raise failure[0]
+    return api
+
+def main(argv=None):
+    from .storage import DEFAULT_DB_PATH, DatabaseSimulator, TaskStore
+
+    parser = argparse.ArgumentParser(description="Serve the TaskMaster JSON API without the UI")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--db", required=True, help="SQLite path for this server alone, or :memory:")
+    args = parser.parse_args(argv)
+    app_db = os.environ.get("TASKMASTER_DB", DEFAULT_DB_PATH)
+    if args.db != ":memory:" and os.path.realpath(args.db) == os.path.realpath(app_db):
+        parser.error(f"{args.db} is the app's database; serve the API from the app with "
+                     "TASKMASTER_API_PORT instead, or give the standalone server its own --db")
+    db = DatabaseSimulator(TaskStore(args.db))
+    api = TaskAPI(db.task_manager, os.environ.get("TASKMASTER_API_TOKEN"))
+    print(f"TaskMaster API on http://{args.host}:{args.port}", flush=True)
+    try:
+        asyncio.run(api.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+import csv
+import io
+import itertools
+import json
+from datetime import date, datetime
+
+from .models import Task, TaskPriority
+
+# ======================
+# BULK IMPORT / EXPORT
+# ======================
+
+FORMATS = ('csv', 'jsonl', 'parquet')
+EXPORT_FIELDS = ('id', 'title', 'description', 'due_date', 'priority', 'completed', 'created_at', 'completed_at')
+DEFAULT_CHUNK_SIZE = 1000
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'done', 'completed'}
+FALSE_VALUES = {'', '0', 'false', 'no', 'n', 'pending'}
+
+class ImportResult:
+    def __init__(self):
+        self.imported = 0
+        # (row number, message) for every rejected row
+        self.errors = []
+
+def _parse_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.fromisoformat(str(value).strip()).date()
+
+def _parse_datetime(value):
+    # Timestamps are kept naive in local time throughout the app; aware ones
+    # (an ISO offset, or a Parquet timestamp column with a zone) are converted
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        moment = value
+    elif isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    else:
+        moment = datetime.fromisoformat(str(value).strip())
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment
+
+def _parse_priority(value):
+    if value is None or value == '':
+        return TaskPriority.MEDIUM
+    if isinstance(value, TaskPriority):
+        return value
+    text = str(value).strip()
+    if text.isdigit():
+        return TaskPriority(int(text))
+    return TaskPriority[text.upper()]
+
+def _parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    if value is None:
+        return False
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError(f"not a boolean: {value!r}")
+
+def _parse_text(value, field):
+    # Bytes that were not valid UTF-8 reach here as lone surrogates (see
+    # _text_stream), as can JSON \udcxx escapes; neither can be stored
+    text = value or ''
+    try:
+        text.encode('utf-8')
+    except UnicodeEncodeError:
+        raise ValueError(f"{field} is not valid UTF-8") from None
+    return text
+
+def parse_task_row(row):
+    # Validate one imported record into a Task; raises ValueError/KeyError on bad input
+    title = _parse_text(row.get('title'), 'title').strip()
+    if not title:
+        raise ValueError("title is required")
+    if row.get('due_date') in (None, ''):
+        raise ValueError("due_date is required")
+    completed = _parse_bool(row.get('completed'))
+    task = Task(
+        title=title,
+        description=_parse_text(row.get('description'), 'description'),
+        due_date=_parse_date(row['due_date']),
+        priority=_parse_priority(row.get('priority')),
+        completed=completed,
+    )
+    # Keep history from the source system when it is provided
+    created_at = _parse_datetime(row.get('created_at'))
+    if created_at is not None:
+        task.created_at = created_at
+    completed_at = _parse_datetime(row.get('completed_at'))
+    if completed:
+        task.completed_at = completed_at or task.created_at
+    return task
+
+def _text_stream(fileobj):
+    # Invalid UTF-8 decodes to lone surrogates instead of raising mid-stream,
+    # so one bad row is rejected by parse_task_row rather than ending the import
+    if isinstance(fileobj, io.TextIOBase):
+        return fileobj
+    return io.TextIOWrapper(fileobj, encoding='utf-8', errors='surrogateescape', newline='')
+
+def _load_record(row):
+    # JSONL lines are parsed here, inside import_tasks' per-row error
+    # handling, so a malformed line is reported like any other invalid row
+    if isinstance(row, str):
+        row = json.loads(row)
+        if not isinstance(row, dict):
+            raise ValueError("not a JSON object")
+    return row
+
+def iter_rows(fileobj, fmt, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Yields records one at a time without reading the whole file: dicts, or
+    # for JSONL the undecoded lines (see _load_record)
+    if fmt == 'csv':
+        yield from csv.DictReader(_text_stream(fileobj))
+    elif fmt == 'jsonl':
+        for line in _text_stream(fileobj):
+            if line.strip():
+                yield line
+    elif fmt == 'parquet':
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(fileobj).iter_batches(batch_size=chunk_size):
+            yield from batch.to_pylist()
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+def _stream_size(fileobj):
+    try:
+        position = fileobj.tell()
+        size = fileobj.seek(0, io.SEEK_END)
+        fileobj.seek(position)
+        return size
+    except (AttributeError, OSError, ValueError):
+        return None
+
+def import_tasks(user, fileobj, fmt, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    # Stream records, validate them into Tasks and add them chunk by chunk with
+    # User.add_tasks; only one chunk of parsed rows is held at a time.
+    # progress(fraction) is called after each chunk when the input size is known.
+    result = ImportResult()
+    if fmt == 'parquet':
+        # Parquet readers jump to the footer first, so report progress in rows
+        import pyarrow.parquet as pq
+
+        total_rows = pq.ParquetFile(fileobj).metadata.num_rows
+        fileobj.seek(0)
+        size = None
+    else:
+        total_rows = None
+        size = _stream_size(fileobj)
+    rows_read = 0
+    rows = enumerate(iter_rows(fileobj, fmt, chunk_size), start=1)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            break
+        tasks = []
+        for row_number, row in chunk:
+            try:
+                tasks.append(parse_task_row(_load_record(row)))
+            except (KeyError, ValueError, TypeError, AttributeError) as exc:
+                result.errors.append((row_number, str(exc) or type(exc).__name__))
+        if tasks:
+            user.add_tasks(tasks)
+            result.imported += len(tasks)
+        rows_read += len(chunk)
+        if progress is not None and total_rows:
+            progress(min(rows_read / total_rows, 1.0))
+        elif progress is not None and size:
+            try:
+                progress(min(fileobj.tell() / size, 1.0))
+            except (OSError, ValueError):
+                pass
+    if progress is not None:
+        progress(1.0)
+    return result
+
+def _export_record(task):
+    return {
+        'id': task.id,
+        'title': task.title,
+        'description': task.description,
+        'due_date': task.due_date.isoformat(),
+        'priority': task.priority.name,
+        'completed': task.completed,
+        'created_at': task.created_at.isoformat() if task.created_at else None,
+        'completed_at': task.completed_at.isoformat() if task.completed_at else None,
+    }
+
+def _chunks(tasks, chunk_size):
+    iterator = iter(tasks)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+class _ChunkSink(io.RawIOBase):
+    # Write-only file object whose contents are drained after each row group
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b''.join(self._parts)
+        self._parts.clear()
+        return data
+
+def export_tasks(user, fmt, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Yields the encoded export in pieces of at most chunk_size tasks, all
+    # from one snapshot of user.tasks taken under the user's lock
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+        for chunk in _chunks(user.tasks, chunk_size):
+            writer.writerows(_export_record(task) for task in chunk)
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode('utf-8')
+    elif fmt == 'jsonl':
+        for chunk in _chunks(user.tasks, chunk_size):
+            yield ''.join(json.dumps(_export_record(task)) + '\n' for task in chunk).encode('utf-8')
+    elif fmt == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([
+            ('id', pa.int64()),
+            ('title', pa.string()),
+            ('description', pa.string()),
+            ('due_date', pa.string()),
+            ('priority', pa.string()),
+            ('completed', pa.bool_()),
+            ('created_at', pa.string()),
+            ('completed_at', pa.string()),
+        ])
+        sink = _ChunkSink()
+        with pq.ParquetWriter(sink, schema) as writer:
+            for chunk in _chunks(user.tasks, chunk_size):
+                writer.write_table(pa.Table.from_pylist([_export_record(task) for task in chunk], schema=schema))
+                yield sink.drain()
+        yield sink.drain()
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
@@ -0,0 +1,819 @@
+import os
+import threading
+from collections import Counter
+from itertools import accumulate, count
+from contextlib import ExitStack, nullcontext
+from datetime import date, datetime, timedelta
+from enum import Enum
+
+from .profiling import profiled
+from .recurrence import Occurrence, add_months
+from .rollups import EventLog, TeamRollups
+from .search import TaskSearchIndex
+from .subscriptions import SubscriptionScheduler
+from .task_index import PendingTaskIndex
+from .user_cache import UserCache
+
+# ======================
+# OOP IMPLEMENTATION
+# ======================
+
+# Version numbers for tasks and users are drawn from one process-wide
+# counter: a version never repeats, even for a user or task loaded again
+# after eviction, so caches keyed on one never serve an older copy's rendering
+_versions = count(1)
+
+def next_version():
+    return next(_versions)
+
+class TaskPriority(Enum):
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+    URGENT = 4
+
+class Task:
+    def __init__(self, title, description, due_date, priority=TaskPriority.MEDIUM, completed=False, recurrence=None):
+        self.id = None
+        self.title = title
+        self.description = description
+        # Ensure due_date is always a date object
+        if isinstance(due_date, datetime):
+            self.due_date = due_date.date()
+        else:
+            self.due_date = due_date
+        self.priority = priority
+        self.completed = completed
+        self.created_at = datetime.now()
+        self.completed_at = self.created_at if completed else None
+        # Renewed on every change so renderings of the task can be memoized
+        self.version = next_version()
+        # A RecurrenceRule makes this a repeating task starting at due_date.
+        # It is never completed as a whole; completed occurrences are kept as
+        # sparse exceptions {due date: completed_at} to the rule.
+        self.recurrence = recurrence
+        self.completed_occurrences = {}
+        
+    def complete_task(self):
+        self.completed = True
+        self.completed_at = datetime.now()
+        self.version = next_version()
+
+    def update(self, priority=None, due_date=None):
+        if priority is not None:
+            self.priority = priority
+        if due_date is not None:
+            self.due_date = due_date
+        self.version = next_version()
+
+    def complete_occurrence(self, due_date):
+        completed_at = datetime.now()
+        self.completed_occurrences[due_date] = completed_at
+        self.version = next_version()
+        return completed_at
+        
+    def __str__(self):
+        return f"{self.title} (Due: {self.due_date.strftime('%Y-%m-%d')}, Priority: {self.priority.name})"
+
+class User:
+    # When enabled, every get_stats() call re-derives the counters by scanning
+    # the task list and fails loudly on drift
+    check_consistency = os.environ.get("TASKMASTER_CHECK_STATS") == "1"
+    # Keep tasks in an array-backed TaskTable instead of a list of Task objects
+    use_task_table = os.environ.get("TASKMASTER_TASK_TABLE") == "1"
+    # Open occurrences of recurring tasks count as pending from this many days
+    # back (older ones lapse) to this many days ahead
+    recurring_lookback_days = 7
+    recurring_horizon_days = 14
+
+    def __init__(self, username, email, is_premium=False, subscription_end=None, store=None, columnar=None, renewal_months=0):
+        self.username = username
+        self.email = email
+        self.is_premium = is_premium
+        self.subscription_end = subscription_end
+        # Plan length an expired subscription renews for; 0 lets it lapse
+        self.renewal_months = renewal_months
+        self.columnar = self.use_task_table if columnar is None else columnar
+        if self.columnar:
+            from .task_table import TaskTable
+            self._tasks = TaskTable()
+        else:
+            self._tasks = []
+        # Task id -> position in self._tasks, and the positions of deleted
+        # tasks that have not been compacted away yet (see delete_tasks)
+        self._positions = {}
+        self._tombstones = set()
+        # Tasks added without a store are numbered per user; stored tasks
+        # keep their row id
+        self._next_id = 1
+        # Recurring tasks are kept apart from self.tasks and its indexes: each
+        # is one rule, expanded into occurrences only for the window in view
+        self.recurring_tasks = []
+        self._recurring_by_id = {}
+        # Optional write-through persistence (see taskmaster.storage.TaskStore)
+        self.store = store
+        # Incremental counters behind get_stats()
+        self._completed_count = 0
+        self._priority_counts = {priority: 0 for priority in TaskPriority}
+        self._pending_due_counts = Counter()
+        self._overdue_as_of = None
+        self._overdue_count = 0
+        # Pending tasks ordered by (due date, priority)
+        self.pending_index = PendingTaskIndex()
+        # Inverted index over titles and descriptions
+        self.search_index = TaskSearchIndex()
+        # Renewed on every task mutation; keys the cached query results below
+        # and any caches built outside the model
+        self.version = next_version()
+        self._query_cache = {}
+        # Sessions share User objects; every mutation and cached query holds
+        # this lock so indexes, counters and caches change together
+        self.lock = threading.RLock()
+        # Mutation stream shared with the owning TaskManager (see attach_events)
+        self.events = None
+        # Expiry heap shared with the owning TaskManager (see attach_subscriptions)
+        self.subscriptions = None
+        
+    @property
+    def tasks(self):
+        # Snapshot of the live tasks in insertion order, taken under the lock
+        # and skipping tombstoned positions. Columnar users get a TaskTable
+        # copy of their live rows, so nothing read from it moves later.
+        with self.lock:
+            if self.columnar:
+                import numpy as np
+
+                return self._tasks.take(np.flatnonzero(self._live_mask()))
+            return list(self._live_tasks())
+
+    def task_count(self):
+        # Number of live one-off tasks, without taking a snapshot
+        with self.lock:
+            return len(self._tasks) - len(self._tombstones)
+
+    def _live_tasks(self):
+        # List users, under self.lock: the tasks at positions not tombstoned
+        if not self._tombstones:
+            return self._tasks
+        tombstones = self._tombstones
+        return (task for position, task in enumerate(self._tasks) if position not in tombstones)
+
+    def _live_mask(self):
+        # Columnar users: True for each row of self._tasks not tombstoned
+        import numpy as np
+
+        live = np.ones(len(self._tasks), dtype=np.bool_)
+        if self._tombstones:
+            live[list(self._tombstones)] = False
+        return live
+
+    def _compact(self):
+        # Drop the tombstoned positions in one pass. Later tasks move up, so
+        # the position-keyed indexes are remapped and the id index is
+        # rebuilt from the first gap on.
+        removed = self._tombstones
+        first = min(removed)
+        new_positions = [kept - 1 for kept in accumulate(position not in removed for position in range(len(self._tasks)))]
+        if self.columnar:
+            self._tasks.delete_rows(sorted(removed))
+        else:
+            self._tasks[:] = [task for position, task in enumerate(self._tasks) if position not in removed]
+        self.pending_index.remap(new_positions)
+        self.search_index.remap(new_positions)
+        tasks = self._tasks
+        for position in range(first, len(tasks)):
+            self._positions[tasks[position].id] = position
+        self._tombstones = set()
+        # Cached query results hold positions
+        self._query_cache.clear()
+
+    def _append(self, task):
+        # Number, store and index one new task
+        if task.id is None:
+            task.id = self._next_id
+        self._next_id = max(self._next_id, task.id + 1)
+        if task.recurrence is not None:
+            self.recurring_tasks.append(task)
+            self._recurring_by_id[task.id] = task
+            return
+        self._tasks.append(task)
+        position = len(self._tasks) - 1
+        self._positions[task.id] = position
+        self._track_task(position, task)
+
+    def get_task(self, task_id):
+        # O(1) lookup by id; None for unknown or deleted ids
+        with self.lock:
+            position = self._positions.get(task_id)
+            if position is not None:
+                return self._tasks[position]
+            return self._recurring_by_id.get(task_id)
+
+    @profiled('User.add_task')
+    def add_task(self, task):
+        with self.lock:
+            if self.store is not None:
+                task.id = self.store.insert_task(self.username, task)
+            self._append(task)
+            self._touch()
+            # A recurring task reaches the event stream one completed
+            # occurrence at a time
+            if self.events is not None and task.recurrence is None:
+                self.events.tasks_added(self.username, [task])
+
+    @profiled('User.add_tasks')
+    def add_tasks(self, tasks):
+        # Batched add_task: one storage transaction and one version bump
+        tasks = list(tasks)
+        with self.lock:
+            if self.store is not None:
+                for task, task_id in zip(tasks, self.store.insert_tasks(self.username, tasks)):
+                    task.id = task_id
+            for task in tasks:
+                self._append(task)
+            self._touch()
+            if self.events is not None:
+                self.events.tasks_added(self.username, [task for task in tasks if task.recurrence is None])
+
+    @profiled('User.load_tasks')
+    def load_tasks(self, tasks):
+        # Attach already-persisted tasks without writing them back
+        tasks = list(tasks)
+        recurring = [task for task in tasks if task.recurrence is not None]
+        tasks = [task for task in tasks if task.recurrence is None]
+        with self.lock:
+            for task in tasks:
+                self._append(task)
+            for task in recurring:
+                self._append(task)
+            self._touch()
+            if self.events is not None:
+                self.events.tasks_added(self.username, tasks)
+                self.events.occurrences_completed(
+                    self.username, [Occurrence(task, day) for task in recurring for day in sorted(task.completed_occurrences)]
+                )
+
+    def attach_events(self, events, replay=True):
+        # Replay this user and its current tasks into events, then publish
+        # every later mutation there as well. A user reloaded after eviction
+        # is already in the stream's history and is not replayed again.
+        with self.lock:
+            self.events = events
+            if not replay:
+                return
+            events.user_added(self.username, self.is_premium)
+            events.tasks_added(self.username, self.tasks)
+            events.occurrences_completed(self.username, self._completed_occurrences())
+        
+    @profiled('User.complete_task')
+    def complete_task(self, task_id, expected_version=None):
+        # False for an unknown or deleted task_id. Optional optimistic check:
+        # a caller that rendered the task list at expected_version is also
+        # rejected if any mutation landed since.
+        with self.lock:
+            if expected_version is not None and expected_version != self.version:
+                return False
+            position = self._positions.get(task_id)
+            if position is None:
+                return False
+            task = self._tasks[position]
+            newly_completed = not task.completed
+            if newly_completed:
+                self._track_completion(position, task)
+            task.complete_task()
+            if self.store is not None:
+                self.store.complete_task(task.id, task.completed_at)
+            self._touch()
+            if newly_completed and self.events is not None:
+                self.events.task_completed(self.username, task)
+            return True
+
+    @profiled('User.complete_occurrence')
+    def complete_occurrence(self, task_id, due_date):
+        # Mark one occurrence of the recurring task task_id done; False if
+        # due_date is not one of its occurrences or already done
+        with self.lock:
+            task = self._recurring_by_id.get(task_id)
+            if task is None:
+                return False
+            if due_date in task.completed_occurrences or not task.recurrence.is_occurrence(task.due_date, due_date):
+                return False
+            completed_at = task.complete_occurrence(due_date)
+            if self.store is not None:
+                self.store.complete_occurrence(task.id, due_date, completed_at)
+            self._touch()
+            if self.events is not None:
+                self.events.occurrences_completed(self.username, [Occurrence(task, due_date)])
+            return True
+
+    def _batch_positions(self, task_ids, expected_version):
+        # Sorted positions of a batch of task ids, or None if the caller
+        # rendered them at an older version or one is unknown or deleted
+        if expected_version is not None and expected_version != self.version:
+            return None
+        positions = []
+        for task_id in set(task_ids):
+            position = self._positions.get(task_id)
+            if position is None:
+                return None
+            positions.append(position)
+        positions.sort()
+        return positions
+
+    @profiled('User.complete_tasks')
+    def complete_tasks(self, task_ids, expected_version=None):
+        # Batched complete_task: one pass over the tasks, one storage
+        # transaction, one version bump and one batch of events
+        with self.lock:
+            positions = self._batch_positions(task_ids, expected_version)
+            if positions is None:
+                return False
+            completed = []
+            for position in positions:
+                task = self._tasks[position]
+                if not task.completed:
+                    self._track_completion(position, task)
+                    task.complete_task()
+                    completed.append(task)
+            if self.store is not None:
+                self.store.complete_tasks([(task.id, task.completed_at) for task in completed])
+            self._touch()
+            if self.events is not None:
+                self.events.tasks_completed(self.username, completed)
+            return True
+
+    @profiled('User.update_tasks')
+    def update_tasks(self, task_ids, priority=None, due_date=None, expected_version=None):
+        # Batched reprioritize/reschedule: a new priority and/or due date for
+        # every task in task_ids, re-indexed one task at a time
+        with self.lock:
+            positions = self._batch_positions(task_ids, expected_version)
+            if positions is None:
+                return False
+            changes = []
+            for position in positions:
+                task = self._tasks[position]
+                changes.append((task.priority, task.due_date, task))
+                # Title and description are unchanged, so the search index is too
+                self._untrack_task(position, task, search=False)
+                task.update(priority, due_date)
+                self._track_task(position, task, search=False)
+            if self.store is not None:
+                self.store.update_tasks([task.id for _, _, task in changes], priority, due_date)
+            self._touch()
+            if self.events is not None:
+                self.events.tasks_updated(self.username, changes)
+            return True
+
+    @profiled('User.delete_tasks')
+    def delete_tasks(self, task_ids, expected_version=None):
+        # Batched delete in O(1) per task plus index updates: each task is
+        # untracked and its position tombstoned, and readers skip tombstones.
+        # The list is compacted only here, once half of it is tombstones.
+        # Ids of recurring tasks delete the rule with its completed occurrences.
+        with self.lock:
+            rules = [self._recurring_by_id[task_id] for task_id in set(task_ids) if task_id in self._recurring_by_id]
+            positions = self._batch_positions(
+                [task_id for task_id in task_ids if task_id not in self._recurring_by_id], expected_version
+            )
+            if positions is None:
+                return False
+            tasks = [self._tasks[position] for position in positions]
+            if self.store is not None:
+                self.store.delete_tasks([task.id for task in tasks + rules])
+            for position, task in zip(positions, tasks):
+                self._untrack_task(position, task)
+                del self._positions[task.id]
+                self._tombstones.add(position)
+            for rule in rules:
+                self.recurring_tasks.remove(rule)
+                del self._recurring_by_id[rule.id]
+            if self.events is not None:
+                # Each completed occurrence was published as a completed task
+                self.events.tasks_deleted(self.username, tasks + self._completed_occurrences(rules))
+            if len(self._tombstones) > len(self._tasks) // 2:
+                self._compact()
+            self._touch()
+            return True
+
+    def _touch(self):
+        self.version = next_version()
+        self._query_cache.clear()
+
+    @profiled('User.find_tasks')
+    def find_tasks(self, status=None, priority=None, sort_by=None):
+        # Positions of the tasks matching the filters, in display order
+        # (resolve them with tasks_at).
+        # status: None/'pending'/'completed'; priority: None or a TaskPriority;
+        # sort_by: None (insertion order), 'due_date' or 'priority'.
+        key = (status, priority, sort_by)
+        with self.lock:
+            indices = self._query_cache.get(key)
+            if indices is None:
+                if self.columnar:
+                    indices = self._find_tasks_columnar(status, priority, sort_by)
+                else:
+                    indices = self._find_tasks_list(status, priority, sort_by)
+                self._query_cache[key] = indices
+            return indices
+
+    @profiled('User.search_tasks')
+    def search_tasks(self, query, status=None, priority=None, limit=None):
+        # Positions of tasks matching query, best match first, optionally
+        # restricted to a status ('pending'/'completed') and a TaskPriority
+        key = ('search', query, status, priority, limit)
+        with self.lock:
+            positions = self._query_cache.get(key)
+            if positions is None:
+                accept = None
+                if status is not None or priority is not None:
+                    tasks = self._tasks
+                    want_completed = status == 'completed'
+
+                    def accept(position):
+                        task = tasks[position]
+                        return ((status is None or task.completed == want_completed)
+                                and (priority is None or task.priority is priority))
+                positions = self.search_index.search(query, accept, limit)
+                self._query_cache[key] = positions
+            return positions
+
+    def _find_tasks_list(self, status, priority, sort_by):
+        tasks = self._tasks
+        tombstones = self._tombstones
+        indices = [
+            i for i, task in enumerate(tasks)
+            if i not in tombstones
+            and (status is None or task.completed == (status == 'completed'))
+            and (priority is None or task.priority is priority)
+        ]
+        if sort_by == 'due_date':
+            indices.sort(key=lambda i: (tasks[i].due_date, -tasks[i].priority.value))
+        elif sort_by == 'priority':
+            indices.sort(key=lambda i: (-tasks[i].priority.value, tasks[i].due_date))
+        return indices
+
+    def _find_tasks_columnar(self, status, priority, sort_by):
+        import numpy as np
+
+        table = self._tasks
+        completed = table.column('completed')
+        mask = self._live_mask()
+        if status is not None:
+            mask &= completed if status == 'completed' else ~completed
+        if priority is not None:
+            mask &= table.column('priorities') == priority.value
+        indices = np.flatnonzero(mask)
+        if sort_by in ('due_date', 'priority'):
+            due_days = table.column('due_days')[indices]
+            priorities = -table.column('priorities')[indices].astype(np.int16)
+            # np.lexsort sorts by the last key first
+            keys = (priorities, due_days) if sort_by == 'due_date' else (due_days, priorities)
+            indices = indices[np.lexsort(keys)]
+        return indices
+            
+    @profiled('User.get_completed_tasks')
+    def get_completed_tasks(self):
+        # Taken under the lock, like self.tasks
+        if self.columnar:
+            return self.tasks.completed_tasks()
+        with self.lock:
+            return [task for task in self._live_tasks() if task.completed]
+    
+    @profiled('User.get_pending_tasks')
+    def get_pending_tasks(self):
+        if self.columnar:
+            return self.tasks.pending_tasks()
+        with self.lock:
+            return [task for task in self._live_tasks() if not task.completed]
+
+    @profiled('User.get_due_buckets')
+    def get_due_buckets(self, today=None, soon_days=3):
+        # Pending (due ordinal, -priority, position) keys split into overdue,
+        # today, soon and later by bisecting the pending index
+        with self.lock:
+            return self.pending_index.buckets(today or date.today(), soon_days)
+
+    @profiled('User.get_next_up')
+    def get_next_up(self, n=3):
+        # top() pops and re-pushes heap entries, so it counts as a mutation
+        with self.lock:
+            return self.tasks_at(self.pending_index.top(n))
+
+    def tasks_at(self, positions):
+        # The tasks at positions returned by find_tasks, search_tasks or
+        # get_due_buckets. Call it under self.lock, in the same block as the
+        # query: once the lock is released, a delete in another session can
+        # compact the list and shift every later position. Columnar rows are copied out as Tasks,
+        # since a TaskView would move with its row.
+        if self.columnar:
+            return self._tasks.detach(list(positions))
+        tasks = self._tasks
+        return [tasks[int(position)] for position in positions]
+
+    def _recurring_window(self, today):
+        return (today - timedelta(days=self.recurring_lookback_days),
+                today + timedelta(days=self.recurring_horizon_days + 1))
+
+    def iter_occurrences(self, window_start, window_end, status=None):
+        # Occurrences of every recurring task due in [window_start, window_end),
+        # expanded lazily rule by rule; status: None/'pending'/'completed'
+        for task in tuple(self.recurring_tasks):
+            done = task.completed_occurrences
+            for day in task.recurrence.occurrences(task.due_date, window_start, window_end):
+                if status is None or (day in done) == (status == 'completed'):
+                    yield Occurrence(task, day)
+
+    @profiled('User.get_pending_occurrences')
+    def get_pending_occurrences(self, today=None):
+        # Open occurrences in the recurring window, by (due date, priority)
+        today = today or date.today()
+        with self.lock:
+            occurrences = list(self.iter_occurrences(*self._recurring_window(today), status='pending'))
+        occurrences.sort(key=lambda occurrence: (occurrence.due_date, -occurrence.priority.value))
+        return occurrences
+
+    def _completed_occurrences(self, rules=None):
+        rules = self.recurring_tasks if rules is None else rules
+        return [Occurrence(task, day) for task in rules for day in sorted(task.completed_occurrences)]
+
+    @profiled('User.get_completed_occurrences')
+    def get_completed_occurrences(self):
+        # Every completed occurrence: the exceptions are all that is stored
+        with self.lock:
+            return self._completed_occurrences()
+
+    def get_analytics_occurrences(self, today=None):
+        # What the analytics frame sees of recurring tasks: every completed
+        # occurrence plus the open ones in the recurring window
+        today = today or date.today()
+        with self.lock:
+            return self._completed_occurrences() + list(
+                self.iter_occurrences(*self._recurring_window(today), status='pending')
+            )
+
+    def _track_task(self, position, task, search=True):
+        if search:
+            self.search_index.add(position, task)
+        self._priority_counts[task.priority] += 1
+        if task.completed:
+            self._completed_count += 1
+            return
+        self.pending_index.add(position, task)
+        self._pending_due_counts[task.due_date] += 1
+        if self._overdue_as_of is not None and task.due_date < self._overdue_as_of:
+            self._overdue_count += 1
+
+    def _untrack_task(self, position, task, search=True):
+        # Reverse of _track_task
+        if search:
+            self.search_index.remove(position, task)
+        self._priority_counts[task.priority] -= 1
+        if task.completed:
+            self._completed_count -= 1
+            return
+        self._untrack_pending(position, task)
+
+    def _track_completion(self, position, task):
+        self._untrack_pending(position, task)
+        self._completed_count += 1
+
+    def _untrack_pending(self, position, task):
+        self.pending_index.remove(position, task)
+        self._pending_due_counts[task.due_date] -= 1
+        if not self._pending_due_counts[task.due_date]:
+            del self._pending_due_counts[task.due_date]
+        if self._overdue_as_of is not None and task.due_date < self._overdue_as_of:
+            self._overdue_count -= 1
+
+    def _overdue_tasks(self, today):
+        # Re-derived from the per-due-date histogram once per day, O(1) otherwise
+        if self._overdue_as_of != today:
+            self._overdue_count = sum(
+                count for due_date, count in self._pending_due_counts.items() if due_date < today
+            )
+            self._overdue_as_of = today
+        return self._overdue_count
+
+    @profiled('User.get_stats')
+    def get_stats(self, today=None):
+        today = today or date.today()
+        with self.lock:
+            stats = {
+                'total_tasks': self.task_count(),
+                'completed_tasks': self._completed_count,
+                'pending_tasks': self.task_count() - self._completed_count,
+                'overdue_tasks': self._overdue_tasks(today),
+                'priority_counts': {priority.name: count for priority, count in self._priority_counts.items()},
+            }
+            if self.check_consistency:
+                self._verify_stats(stats, today)
+            if self.recurring_tasks:
+                self._add_recurring_stats(stats, today)
+        return stats
+
+    def _add_recurring_stats(self, stats, today):
+        # Each completed occurrence counts as a completed task and each open
+        # one in the recurring window as a pending one; O(window) per rule
+        window_start, window_end = self._recurring_window(today)
+        priority_counts = stats['priority_counts']
+        for task in self.recurring_tasks:
+            done = task.completed_occurrences
+            pending = overdue = 0
+            for day in task.recurrence.occurrences(task.due_date, window_start, window_end):
+                if day not in done:
+                    pending += 1
+                    overdue += day < today
+            stats['total_tasks'] += len(done) + pending
+            stats['completed_tasks'] += len(done)
+            stats['pending_tasks'] += pending
+            stats['overdue_tasks'] += overdue
+            priority_counts[task.priority.name] += len(done) + pending
+
+    def _verify_stats(self, stats, today):
+        tasks = self.tasks
+        pending = [task for task in tasks if not task.completed]
+        expected = {
+            'total_tasks': len(tasks),
+            'completed_tasks': len(tasks) - len(pending),
+            'pending_tasks': len(pending),
+            'overdue_tasks': sum(1 for task in pending if task.due_date < today),
+            'priority_counts': {
+                priority.name: sum(1 for task in tasks if task.priority is priority)
+                for priority in TaskPriority
+            },
+        }
+        if stats != expected:
+            raise AssertionError(f"Task counters for {self.username} drifted: {stats} != {expected}")
+    
+    def attach_subscriptions(self, subscriptions):
+        # Hand this user's expiry to the scheduler, now and after every change
+        with self.lock:
+            self.subscriptions = subscriptions
+            if self.is_premium and self.subscription_end is not None:
+                subscriptions.schedule(self.username, self.subscription_end)
+
+    @profiled('User.upgrade_to_premium')
+    def upgrade_to_premium(self, months=1, auto_renew=None):
+        # auto_renew: True renews for `months` at each expiry, False lets the
+        # subscription lapse, None keeps the current setting
+        with self.lock:
+            self.is_premium = True
+            if self.subscription_end is None or self.subscription_end < datetime.now():
+                self.subscription_end = datetime.now()
+            self.subscription_end = add_months(self.subscription_end, months)
+            if auto_renew is not None:
+                self.renewal_months = months if auto_renew else 0
+            self._save_subscription()
+            if self.subscriptions is not None:
+                self.subscriptions.schedule(self.username, self.subscription_end)
+            if self.events is not None:
+                self.events.premium_changed(self.username, self.is_premium)
+
+    def cancel_renewal(self):
+        with self.lock:
+            self.renewal_months = 0
+            self._save_subscription()
+
+    def renew_or_expire(self, now=None):
+        # Called by the subscription sweep once subscription_end has passed:
+        # extend by renewal_months (as many periods as were missed) or drop
+        # to the free tier. Returns 'renewed', 'expired' or None if the
+        # subscription is no longer due.
+        now = now or datetime.now()
+        with self.lock:
+            if not self.is_premium or self.subscription_end is None or self.subscription_end > now:
+                return None
+            if self.renewal_months:
+                # Periods missed while no sweep ran are counted from the end
+                # that passed, not chained, so only one clamp can apply
+                anchor, periods = self.subscription_end, 1
+                while add_months(anchor, periods * self.renewal_months) <= now:
+                    periods += 1
+                self.subscription_end = add_months(anchor, periods * self.renewal_months)
+                outcome = 'renewed'
+            else:
+                self.is_premium = False
+                outcome = 'expired'
+            self._save_subscription()
+            if self.subscriptions is not None and self.is_premium:
+                self.subscriptions.schedule(self.username, self.subscription_end)
+            if not self.is_premium and self.events is not None:
+                self.events.premium_changed(self.username, self.is_premium)
+            return outcome
+
+    def _save_subscription(self):
+        if self.store is not None:
+            self.store.update_subscription(self.username, self.is_premium, self.subscription_end, self.renewal_months)
+
+class TaskManager:
+    # Lock striping for register/load: sessions touching different users rarely
+    # share a stripe, and loading one large user does not block the others
+    LOCK_STRIPES = 64
+    # Memory budget for loaded users, in MB (see UserCache); 0 never evicts
+    cache_budget_mb = float(os.environ.get("TASKMASTER_USER_CACHE_MB", "256"))
+
+    def __init__(self, store=None, cache_budget_mb=None):
+        # Loaded users. With a store this is an LRU cache in front of the
+        # users table: idle users are evicted once over budget and reloaded
+        # on their next login_user(). Without one it is the only copy.
+        budget_mb = self.cache_budget_mb if cache_budget_mb is None else cache_budget_mb
+        self.users = UserCache(int(budget_mb * 2**20) if store is not None and budget_mb else None)
+        # Users whose tasks have been replayed into self.events
+        self._published = set()
+        self.store = store
+        self._stripes = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        # Every user in self.users publishes its mutations here; the rollups
+        # behind the admin dashboard are kept up to date from the stream
+        self.events = EventLog()
+        self.rollups = TeamRollups()
+        self.events.subscribe(self.rollups.apply)
+        if store is not None:
+            # Stored users are counted from aggregate SQL once, at startup;
+            # loading one later must not replay its tasks into the stream
+            totals = store.rollup_totals()
+            self.rollups.seed(**totals)
+            self._published.update(username for username, _ in totals['users'])
+        # Expiry of every premium user, swept by sweep_subscriptions(). Users
+        # that have not logged in since startup are scheduled straight from
+        # the store, and loaded by the sweep only once they come due.
+        self.subscriptions = SubscriptionScheduler()
+        if store is not None:
+            self.subscriptions.schedule_many(store.subscription_ends())
+
+    def _stripe(self, username):
+        return self._stripes[hash(username) % self.LOCK_STRIPES]
+        
+    @profiled('TaskManager.register_user')
+    def register_user(self, username, email):
+        # Check-then-insert is atomic per username
+        with self._stripe(username):
+            if self.store is not None:
+                if not self.store.insert_user(username, email):
+                    return False
+                user = User(username, email, store=self.store)
+            elif username not in self.users:
+                user = User(username, email)
+            else:
+                return False
+            self._attach(user)
+            self.users.put(username, user)
+            return True
+    
+    @profiled('TaskManager.login_user')
+    def login_user(self, username):
+        # Sessions and API requests keep only the username and come back
+        # here on every rerun: a cache hit, or a reload after eviction
+        user = self.users.lookup(username)
+        if user is None and self.store is not None:
+            # Only one session loads a given user; the rest wait and share it,
+            # so no two User objects for the same account can diverge
+            with self._stripe(username):
+                user = self.users.lookup(username)
+                if user is None:
+                    user = self.store.load_user(username)
+                    if user is not None:
+                        self._attach(user)
+                        self.users.put(username, user, loaded=True)
+        return user
+
+    def _attach(self, user):
+        user.attach_events(self.events, replay=user.username not in self._published)
+        self._published.add(user.username)
+        user.attach_subscriptions(self.subscriptions)
+    
+    @profiled('TaskManager.sweep_subscriptions')
+    def sweep_subscriptions(self, now=None):
+        # Renew or downgrade every subscription that ended by now. Only the
+        # due users are touched, and their writes share one transaction.
+        # Returns {'renewed': n, 'expired': n}.
+        now = now or datetime.now()
+        outcomes = Counter()
+        due = self.subscriptions.pop_due(now)
+        if not due:
+            return outcomes
+        # Evicted users are reloaded first: the scheduler outlives them, and
+        # login_user takes a stripe lock that must not nest in the store's
+        users = [self.login_user(username) for username, _ in due]
+        users = sorted((user for user in users if user is not None), key=lambda user: user.username)
+        # User mutations lock the user, then the store; the sweep does the
+        # same, taking the due users' locks (in username order, as nothing
+        # else holds two of them) before opening the transaction
+        with ExitStack() as locks:
+            for user in users:
+                locks.enter_context(user.lock)
+            with self.store.transaction() if self.store is not None else nullcontext():
+                for user in users:
+                    outcome = user.renew_or_expire(now)
+                    if outcome is not None:
+                        outcomes[outcome] += 1
+        return outcomes
+
+    @profiled('TaskManager.get_user_stats')
+    def get_user_stats(self, username):
+        user = self.login_user(username)
+        if user is not None:
+            stats = user.get_stats()
+            stats['premium_user'] = user.is_premium
+            return stats
+        return None
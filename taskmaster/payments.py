@@ -0,0 +1,120 @@
+import abc
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+
+# ======================
+# PAYMENT PROCESSING
+# ======================
+
+# Price in cents for each plan length in months
+PLAN_PRICES = {1: 500, 12: 4800}
+# Finished payments nobody settled (failures, abandoned tabs) and gateway
+# answers kept for replay; the oldest are dropped beyond these counts
+MAX_FINISHED_PAYMENTS = 10_000
+MAX_REPLAYED_KEYS = 10_000
+
+class PaymentStatus(Enum):
+    PENDING = "pending"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class PaymentGateway(abc.ABC):
+    # Interface for card authorization backends. authorize() may block; it is
+    # only ever called from PaymentProcessor's worker threads.
+    @abc.abstractmethod
+    def authorize(self, idempotency_key, amount_cents, card):
+        # True if the card was charged amount_cents; the same key must
+        # always get the same answer
+        ...
+
+class LocalGatewayStub(PaymentGateway):
+    # Stand-in for a real gateway: approves a configurable share of payments
+    # after a simulated network delay, and replays the first answer per key
+    # for the last max_keys keys
+    def __init__(self, success_rate=0.8, latency=2.0, seed=None, max_keys=MAX_REPLAYED_KEYS):
+        self.success_rate = success_rate
+        self.latency = latency
+        self.max_keys = max_keys
+        self._rng = random.Random(seed)
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def authorize(self, idempotency_key, amount_cents, card):
+        with self._lock:
+            if idempotency_key in self._results:
+                return self._results[idempotency_key]
+        time.sleep(self.latency)
+        with self._lock:
+            approved = self._results.setdefault(idempotency_key, self._rng.random() < self.success_rate)
+            while len(self._results) > self.max_keys:
+                self._results.popitem(last=False)
+        return approved
+
+class Payment:
+    def __init__(self, key, username, months, amount_cents):
+        self.key = key
+        self.username = username
+        self.months = months
+        self.amount_cents = amount_cents
+        self.status = PaymentStatus.PENDING
+        self.error = None
+        self.settled = False
+
+class PaymentProcessor:
+    # Runs gateway calls on a background executor so Streamlit script threads
+    # never wait on them; the UI polls get() for the outcome. A payment is
+    # forgotten once settled, or once max_finished later ones have finished.
+    def __init__(self, gateway=None, max_workers=4, max_finished=MAX_FINISHED_PAYMENTS):
+        self.gateway = gateway if gateway is not None else LocalGatewayStub()
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="payments")
+        self._payments = {}
+        # Keys of finished payments, oldest first; settled ones are already gone
+        self._finished = deque()
+        self._lock = threading.Lock()
+
+    def submit(self, key, username, months, card):
+        # Idempotent: resubmitting a known key returns the existing payment
+        with self._lock:
+            payment = self._payments.get(key)
+            if payment is not None:
+                return payment
+            payment = Payment(key, username, months, PLAN_PRICES.get(months, PLAN_PRICES[1] * months))
+            self._payments[key] = payment
+        # Card details go to the gateway only and are not kept on the Payment
+        self._executor.submit(self._authorize, payment, card)
+        return payment
+
+    def _authorize(self, payment, card):
+        try:
+            approved = self.gateway.authorize(payment.key, payment.amount_cents, card)
+        except Exception as exc:
+            payment.error = str(exc)
+            approved = False
+        with self._lock:
+            payment.status = PaymentStatus.SUCCEEDED if approved else PaymentStatus.FAILED
+            self._finished.append(payment.key)
+            while len(self._finished) > self.max_finished:
+                self._payments.pop(self._finished.popleft(), None)
+
+    def get(self, key):
+        with self._lock:
+            return self._payments.get(key)
+
+    def settle(self, key):
+        # Claim a succeeded payment exactly once so the upgrade is applied
+        # once; the claimed payment is dropped
+        with self._lock:
+            payment = self._payments.get(key)
+            if payment is None or payment.status is not PaymentStatus.SUCCEEDED or payment.settled:
+                return None
+            payment.settled = True
+            del self._payments[key]
+            return payment
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
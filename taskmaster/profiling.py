@@ -0,0 +1,152 @@
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+
+# ======================
+# HOT-PATH PROFILER
+# ======================
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is +Inf
+BUCKET_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_DISABLED_SPAN = nullcontext()
+
+class Histogram:
+    # Per-bucket (non-cumulative) counts plus sum and max for one section
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms):
+        self.buckets[bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation (max for +Inf)
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS_MS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'mean_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'p50_ms': round(self.quantile(0.5), 3),
+            'p95_ms': round(self.quantile(0.95), 3),
+            'max_ms': round(self.max_ms, 3),
+        }
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.observe(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+class Profiler:
+    # Process-wide span timings aggregated into one histogram per section.
+    # While disabled, span() hands back a shared no-op context manager.
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def span(self, name):
+        if not self.enabled:
+            return _DISABLED_SPAN
+        return _Span(self, name)
+
+    def observe(self, name, ms):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(ms)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def summary(self):
+        # {section: {count, total_ms, mean_ms, p50_ms, p95_ms, max_ms}}, slowest total first
+        with self._lock:
+            summaries = {name: histogram.summary() for name, histogram in self._histograms.items()}
+        return dict(sorted(summaries.items(), key=lambda item: -item[1]['total_ms']))
+
+    def to_json(self):
+        with self._lock:
+            sections = {
+                name: dict(histogram.summary(), buckets=dict(zip(
+                    [str(bound) for bound in BUCKET_BOUNDS_MS] + ['+Inf'], histogram.buckets
+                )))
+                for name, histogram in self._histograms.items()
+            }
+        return json.dumps({'bucket_bounds_ms': BUCKET_BOUNDS_MS, 'sections': sections}, indent=2, sort_keys=True)
+
+    def to_prometheus(self):
+        # Text exposition format; one histogram series per section label, in seconds
+        lines = [
+            "# HELP taskmaster_section_seconds Wall time spent in instrumented sections",
+            "# TYPE taskmaster_section_seconds histogram",
+        ]
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            for name, histogram in histograms:
+                label = name.replace('\\', '\\\\').replace('"', '\\"')
+                cumulative = 0
+                for bound, count in zip(BUCKET_BOUNDS_MS, histogram.buckets):
+                    cumulative += count
+                    lines.append(f'taskmaster_section_seconds_bucket{{section="{label}",le="{bound / 1000:g}"}} {cumulative}')
+                lines.append(f'taskmaster_section_seconds_bucket{{section="{label}",le="+Inf"}} {histogram.count}')
+                lines.append(f'taskmaster_section_seconds_sum{{section="{label}"}} {histogram.total_ms / 1000:.6f}')
+                lines.append(f'taskmaster_section_seconds_count{{section="{label}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        # Format follows the extension: .json, anything else is Prometheus text
+        content = self.to_json() if path.endswith('.json') else self.to_prometheus()
+        with open(path, 'w') as f:
+            f.write(content)
+
+profiler = Profiler(enabled=os.environ.get("TASKMASTER_PROFILE") == "1")
+if profiler.enabled and os.environ.get("TASKMASTER_PROFILE_DUMP"):
+    atexit.register(profiler.dump, os.environ["TASKMASTER_PROFILE_DUMP"])
+
+def profiled(name):
+    # Method decorator timing each call as a span. Applied only when profiling
+    # is enabled at import time, so disabled builds keep the bare function.
+    def decorate(func):
+        if not profiler.enabled:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profiler.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,146 @@
+import calendar
+from datetime import date, datetime, timedelta
+
+# ======================
+# RECURRING TASKS
+# ======================
+
+FREQUENCY_UNITS = {'daily': 'day', 'weekly': 'week', 'monthly': 'month'}
+
+def add_months(moment, months):
+    # Calendar-correct month arithmetic: clamp to the last day of the target month
+    month_index = moment.month - 1 + months
+    year = moment.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(moment.day, calendar.monthrange(year, month)[1])
+    return moment.replace(year=year, month=month, day=day)
+
+class RecurrenceRule:
+    # "Every `interval` days/weeks/months from the task's due date, up to
+    # `until`". Occurrences are computed, never stored: the n-th one is derived
+    # from the start date directly, so month-end starts do not drift.
+    def __init__(self, frequency, interval=1, until=None):
+        if frequency not in FREQUENCY_UNITS:
+            raise ValueError(f"Unknown frequency: {frequency!r}")
+        if interval < 1:
+            raise ValueError("interval must be at least 1")
+        self.frequency = frequency
+        self.interval = int(interval)
+        self.until = until
+
+    def __eq__(self, other):
+        return isinstance(other, RecurrenceRule) and self.to_text() == other.to_text()
+
+    def __hash__(self):
+        return hash(self.to_text())
+
+    def __str__(self):
+        unit = FREQUENCY_UNITS[self.frequency]
+        text = f"every {unit}" if self.interval == 1 else f"every {self.interval} {unit}s"
+        if self.until is not None:
+            text += f" until {self.until:%Y-%m-%d}"
+        return text
+
+    def to_text(self):
+        # Storage form: "weekly:2" or "monthly:1:2027-01-31"
+        text = f"{self.frequency}:{self.interval}"
+        return text if self.until is None else f"{text}:{self.until.isoformat()}"
+
+    @classmethod
+    def from_text(cls, text):
+        frequency, interval, *until = text.split(':')
+        return cls(frequency, int(interval), date.fromisoformat(until[0]) if until else None)
+
+    def _nth(self, start, n):
+        if self.frequency == 'daily':
+            return start + timedelta(days=n * self.interval)
+        if self.frequency == 'weekly':
+            return start + timedelta(weeks=n * self.interval)
+        return add_months(start, n * self.interval)
+
+    def _first_index(self, start, day):
+        # Index of the first occurrence on or after day
+        if day <= start:
+            return 0
+        if self.frequency == 'monthly':
+            months = (day.year - start.year) * 12 + day.month - start.month
+            n = max(0, months // self.interval - 1)
+        else:
+            step = self.interval * (1 if self.frequency == 'daily' else 7)
+            n = -(-(day - start).days // step)
+        while self._nth(start, n) < day:
+            n += 1
+        return n
+
+    def occurrences(self, start, window_start, window_end):
+        # Occurrence dates in [window_start, window_end), lazily, in order
+        if self.until is not None and self.until < window_end:
+            window_end = self.until + timedelta(days=1)
+        n = self._first_index(start, window_start)
+        while True:
+            day = self._nth(start, n)
+            if day >= window_end:
+                return
+            yield day
+            n += 1
+
+    def is_occurrence(self, start, day):
+        if day < start or (self.until is not None and day > self.until):
+            return False
+        return self._nth(start, self._first_index(start, day)) == day
+
+class Occurrence:
+    # Task-like view of one occurrence of a recurring task. Identity is
+    # (task, due date), so card and query caches can key on it like a Task.
+    __slots__ = ('task', 'due_date')
+
+    def __init__(self, task, due_date):
+        self.task = task
+        self.due_date = due_date
+
+    @property
+    def id(self):
+        return self.task.id
+
+    @property
+    def title(self):
+        return self.task.title
+
+    @property
+    def description(self):
+        return self.task.description
+
+    @property
+    def priority(self):
+        return self.task.priority
+
+    @property
+    def recurrence(self):
+        return self.task.recurrence
+
+    @property
+    def completed_at(self):
+        return self.task.completed_occurrences.get(self.due_date)
+
+    @property
+    def completed(self):
+        return self.due_date in self.task.completed_occurrences
+
+    @property
+    def created_at(self):
+        # An occurrence becomes actionable on its due date
+        return max(self.task.created_at, datetime.combine(self.due_date, datetime.min.time()))
+
+    @property
+    def version(self):
+        # Renewed whenever any occurrence of the task is completed
+        return self.task.version
+
+    def __eq__(self, other):
+        return isinstance(other, Occurrence) and other.task is self.task and other.due_date == self.due_date
+
+    def __hash__(self):
+        return hash((id(self.task), self.due_date))
+
+    def __str__(self):
+        return f"{self.title} (Due: {self.due_date.strftime('%Y-%m-%d')}, Priority: {self.priority.name}, {self.recurrence})"
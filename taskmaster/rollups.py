@@ -0,0 +1,223 @@
+import threading
+from collections import Counter, deque, namedtuple
+from datetime import date
+
+# ======================
+# TASK EVENT STREAM
+# ======================
+
+# kind is one of USER_ADDED, PREMIUM_CHANGED, TASK_ADDED, TASK_COMPLETED,
+# TASK_DELETED, OCCURRENCE_COMPLETED. Task events carry the task's priority,
+# due date and completion date; user events carry the premium flag. An edit
+# is published as the old version deleted and the new version added.
+TaskEvent = namedtuple('TaskEvent', 'seq kind username is_premium priority due_date completed_on')
+
+USER_ADDED = 'user_added'
+PREMIUM_CHANGED = 'premium_changed'
+TASK_ADDED = 'task_added'
+TASK_COMPLETED = 'task_completed'
+TASK_DELETED = 'task_deleted'
+# A recurring task is only counted once an occurrence of it is done, as a
+# completed task due on the occurrence's date
+OCCURRENCE_COMPLETED = 'occurrence_completed'
+
+class EventLog:
+    # Append-only stream of user and task mutations. Subscribers are applied
+    # synchronously, in sequence order, under the log lock; only the most
+    # recent `retain` events are kept for inspection.
+    def __init__(self, retain=10_000):
+        self._events = deque(maxlen=retain)
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self.seq = 0
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def user_added(self, username, is_premium):
+        with self._lock:
+            self._publish(USER_ADDED, username, is_premium, None, None, None)
+
+    def premium_changed(self, username, is_premium):
+        with self._lock:
+            self._publish(PREMIUM_CHANGED, username, is_premium, None, None, None)
+
+    def tasks_added(self, username, tasks):
+        # One lock acquisition for a batch of tasks
+        with self._lock:
+            for task in tasks:
+                self._publish(TASK_ADDED, username, None, task.priority, task.due_date,
+                              task.completed_at.date() if task.completed else None)
+
+    def task_completed(self, username, task):
+        self.tasks_completed(username, [task])
+
+    def tasks_completed(self, username, tasks):
+        with self._lock:
+            for task in tasks:
+                self._publish(TASK_COMPLETED, username, None, task.priority, task.due_date, task.completed_at.date())
+
+    def tasks_deleted(self, username, tasks):
+        with self._lock:
+            for task in tasks:
+                self._publish(TASK_DELETED, username, None, task.priority, task.due_date,
+                              task.completed_at.date() if task.completed else None)
+
+    def tasks_updated(self, username, changes):
+        # changes: (priority, due date) before the edit and the edited task
+        with self._lock:
+            for priority, due_date, task in changes:
+                completed_on = task.completed_at.date() if task.completed else None
+                self._publish(TASK_DELETED, username, None, priority, due_date, completed_on)
+                self._publish(TASK_ADDED, username, None, task.priority, task.due_date, completed_on)
+
+    def occurrences_completed(self, username, occurrences):
+        with self._lock:
+            for occurrence in occurrences:
+                self._publish(OCCURRENCE_COMPLETED, username, None, occurrence.priority, occurrence.due_date,
+                              occurrence.completed_at.date())
+
+    def _publish(self, *fields):
+        self.seq += 1
+        event = TaskEvent(self.seq, *fields)
+        self._events.append(event)
+        for callback in self._subscribers:
+            callback(event)
+
+    def recent(self, n=50):
+        with self._lock:
+            return list(self._events)[-n:]
+
+# ======================
+# TEAM ROLLUPS
+# ======================
+
+class TeamRollups:
+    # Aggregates over every user attached to a TaskManager, maintained from the
+    # event stream in O(1) per event. Overdue counts are re-derived from the
+    # per-due-date histogram once per day, like User.get_stats().
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Per user: premium flag and [tasks, completed]; per tier (keyed by the
+        # premium flag): [users, tasks, completed]
+        self.premium = {}
+        self.task_counts = {}
+        self.tiers = {True: [0, 0, 0], False: [0, 0, 0]}
+        self.completions_per_day = Counter()
+        self.priority_mix = Counter()
+        self.pending_priority_mix = Counter()
+        self._pending_due_counts = Counter()
+        self._overdue_as_of = None
+        self._overdue_count = 0
+
+    def seed(self, users, task_counts, completions, priority_mix, pending):
+        # Start from aggregates computed by the store (TaskStore.rollup_totals)
+        # instead of replaying every user's tasks; the stream keeps them
+        # current from then on
+        with self._lock:
+            for username, is_premium in users:
+                counts = task_counts.get(username, [0, 0])
+                self.premium[username] = is_premium
+                self.task_counts[username] = list(counts)
+                tier = self.tiers[is_premium]
+                tier[0] += 1
+                tier[1] += counts[0]
+                tier[2] += counts[1]
+            self.completions_per_day.update(completions)
+            self.priority_mix.update(priority_mix)
+            for priority, due_date, count in pending:
+                self._add_pending(priority, due_date, count)
+
+    def apply(self, event):
+        with self._lock:
+            if event.kind == USER_ADDED:
+                self.premium[event.username] = event.is_premium
+                self.task_counts[event.username] = [0, 0]
+                self.tiers[event.is_premium][0] += 1
+            elif event.kind == PREMIUM_CHANGED:
+                was_premium = self.premium[event.username]
+                if was_premium != event.is_premium:
+                    total, completed = self.task_counts[event.username]
+                    for tier, sign in ((self.tiers[was_premium], -1), (self.tiers[event.is_premium], 1)):
+                        tier[0] += sign
+                        tier[1] += sign * total
+                        tier[2] += sign * completed
+                    self.premium[event.username] = event.is_premium
+            elif event.kind in (TASK_ADDED, OCCURRENCE_COMPLETED):
+                counts = self.task_counts[event.username]
+                tier = self.tiers[self.premium[event.username]]
+                counts[0] += 1
+                tier[1] += 1
+                self.priority_mix[event.priority] += 1
+                if event.completed_on is not None:
+                    counts[1] += 1
+                    tier[2] += 1
+                    self.completions_per_day[event.completed_on] += 1
+                else:
+                    self._add_pending(event.priority, event.due_date, 1)
+            elif event.kind == TASK_COMPLETED:
+                self.task_counts[event.username][1] += 1
+                self.tiers[self.premium[event.username]][2] += 1
+                self.completions_per_day[event.completed_on] += 1
+                self._add_pending(event.priority, event.due_date, -1)
+            elif event.kind == TASK_DELETED:
+                counts = self.task_counts[event.username]
+                tier = self.tiers[self.premium[event.username]]
+                counts[0] -= 1
+                tier[1] -= 1
+                self.priority_mix[event.priority] -= 1
+                if not self.priority_mix[event.priority]:
+                    del self.priority_mix[event.priority]
+                if event.completed_on is not None:
+                    counts[1] -= 1
+                    tier[2] -= 1
+                    self.completions_per_day[event.completed_on] -= 1
+                else:
+                    self._add_pending(event.priority, event.due_date, -1)
+
+    def _add_pending(self, priority, due_date, delta):
+        self.pending_priority_mix[priority] += delta
+        if not self.pending_priority_mix[priority]:
+            del self.pending_priority_mix[priority]
+        self._pending_due_counts[due_date] += delta
+        if not self._pending_due_counts[due_date]:
+            del self._pending_due_counts[due_date]
+        if self._overdue_as_of is not None and due_date < self._overdue_as_of:
+            self._overdue_count += delta
+
+    def _overdue_tasks(self, today):
+        if self._overdue_as_of != today:
+            self._overdue_count = sum(
+                count for due_date, count in self._pending_due_counts.items() if due_date < today
+            )
+            self._overdue_as_of = today
+        return self._overdue_count
+
+    def snapshot(self, today=None, days=30):
+        # Point-in-time copy for the dashboard: totals, premium vs free split,
+        # priority mix and the last `days` days of completions (oldest first)
+        today = today or date.today()
+        with self._lock:
+            tiers = {
+                name: dict(zip(('users', 'tasks', 'completed'), self.tiers[is_premium]))
+                for name, is_premium in (('premium', True), ('free', False))
+            }
+            first_day = today.toordinal() - days + 1
+            return {
+                'users': len(self.premium),
+                'total_tasks': tiers['premium']['tasks'] + tiers['free']['tasks'],
+                'completed_tasks': tiers['premium']['completed'] + tiers['free']['completed'],
+                'overdue_tasks': self._overdue_tasks(today),
+                'tiers': tiers,
+                'priority_mix': _by_priority(self.priority_mix),
+                'pending_priority_mix': _by_priority(self.pending_priority_mix),
+                'completions_per_day': {
+                    date.fromordinal(day): self.completions_per_day[date.fromordinal(day)]
+                    for day in range(first_day, today.toordinal() + 1)
+                },
+            }
+
+def _by_priority(counts):
+    # {priority name: count}, lowest priority first
+    return {priority.name: count for priority, count in sorted(counts.items(), key=lambda item: item[0].value)}
@@ -0,0 +1,108 @@
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+
+# ======================
+# FULL-TEXT SEARCH
+# ======================
+
+TOKEN_PATTERN = re.compile(r"\w+")
+TITLE_WEIGHT = 3
+DESCRIPTION_WEIGHT = 1
+# A prefix such as "a" could expand to most of the vocabulary; only the
+# most common matching terms are considered
+MAX_PREFIX_TERMS = 64
+PREFIX_DISCOUNT = 0.5
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+class TaskSearchIndex:
+    # Inverted index over task titles and descriptions, keyed by position in
+    # User.tasks. postings[term][position] is the field-weighted term frequency.
+    def __init__(self):
+        self.postings = {}
+        self._terms = []
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, position, task):
+        weights = {}
+        for term in tokenize(task.title):
+            weights[term] = weights.get(term, 0) + TITLE_WEIGHT
+        for term in tokenize(task.description or ""):
+            weights[term] = weights.get(term, 0) + DESCRIPTION_WEIGHT
+        for term, weight in weights.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                insort(self._terms, term)
+            postings[position] = weight
+        self._size += 1
+
+    def remove(self, position, task):
+        for term in set(tokenize(task.title)) | set(tokenize(task.description or "")):
+            postings = self.postings.get(term)
+            if postings is not None and postings.pop(position, None) is not None and not postings:
+                del self.postings[term]
+                del self._terms[bisect_left(self._terms, term)]
+        self._size -= 1
+
+    def remap(self, new_positions):
+        # Positions shifted by deleting tasks (see PendingTaskIndex.remap)
+        for term, postings in self.postings.items():
+            self.postings[term] = {new_positions[position]: weight for position, weight in postings.items()}
+
+    def _expand(self, token):
+        # Exact term plus vocabulary terms starting with token
+        start = bisect_left(self._terms, token)
+        matches = []
+        for term in self._terms[start:]:
+            if not term.startswith(token):
+                break
+            matches.append(term)
+        if len(matches) > MAX_PREFIX_TERMS:
+            matches = heapq.nlargest(MAX_PREFIX_TERMS, matches, key=lambda term: len(self.postings[term]))
+            if token in self.postings and token not in matches:
+                matches.append(token)
+        return matches
+
+    def search(self, query, accept=None, limit=None):
+        # Every query token must match (as a word or word prefix); results are
+        # ranked by summed tf-idf with prefix matches discounted. accept is an
+        # optional predicate on the position used for filtering.
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        per_token = []
+        for token in tokens:
+            token_scores = {}
+            for term in self._expand(token):
+                postings = self.postings[term]
+                idf = math.log(1 + self._size / len(postings))
+                if term != token:
+                    idf *= PREFIX_DISCOUNT
+                for position, weight in postings.items():
+                    score = weight * idf
+                    if token_scores.get(position, 0) < score:
+                        token_scores[position] = score
+            if not token_scores:
+                return []
+            per_token.append(token_scores)
+        # Intersect starting from the most selective token
+        per_token.sort(key=len)
+        scores = per_token[0]
+        for token_scores in per_token[1:]:
+            scores = {position: score + token_scores[position]
+                      for position, score in scores.items() if position in token_scores}
+        if accept is not None:
+            scores = {position: score for position, score in scores.items() if accept(position)}
+        ranked = ((score, -position) for position, score in scores.items())
+        if limit is not None:
+            best = heapq.nlargest(limit, ranked)
+        else:
+            best = sorted(ranked, reverse=True)
+        return [-negative_position for _, negative_position in best]
@@ -0,0 +1,315 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+
+from .models import Task, TaskManager, TaskPriority, User
+from .profiling import profiled
+from .recurrence import RecurrenceRule
+
+# ======================
+# SQLITE TASK STORE
+# ======================
+
+DEFAULT_DB_PATH = "taskmaster.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    email TEXT NOT NULL,
+    is_premium INTEGER NOT NULL DEFAULT 0,
+    subscription_end TEXT,
+    renewal_months INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL REFERENCES users(username),
+    title TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    due_date TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    completed_at TEXT,
+    recurrence TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_user ON tasks(username, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_user_pending ON tasks(username, completed, due_date);
+CREATE TABLE IF NOT EXISTS task_occurrences (
+    task_id INTEGER NOT NULL REFERENCES tasks(id),
+    due_date TEXT NOT NULL,
+    completed_at TEXT NOT NULL,
+    PRIMARY KEY (task_id, due_date)
+);
+"""
+
+# Columns added after the first release, applied to older databases on open
+MIGRATIONS = [
+    ('tasks', 'recurrence', "ALTER TABLE tasks ADD COLUMN recurrence TEXT"),
+    ('users', 'renewal_months', "ALTER TABLE users ADD COLUMN renewal_months INTEGER NOT NULL DEFAULT 0"),
+]
+
+def _to_text(value):
+    return value.isoformat() if value is not None else None
+
+def _to_datetime(value):
+    return datetime.fromisoformat(value) if value is not None else None
+
+class TaskStore:
+    # One pooled connection per process, shared by every Streamlit session.
+    # sqlite3 connections are not safe for concurrent use, so access is serialized.
+    def __init__(self, path=None):
+        if path is None:
+            path = os.environ.get("TASKMASTER_DB", DEFAULT_DB_PATH)
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+        for table, column, sql in MIGRATIONS:
+            if column not in {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}:
+                self._conn.execute(sql)
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            if self._conn.in_transaction:
+                # Nested use joins the outer transaction
+                yield self._conn
+                return
+            self._conn.execute("BEGIN")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def _fetchall(self, sql, params=()):
+        # Rows are fetched under the lock too, so another session cannot
+        # interleave statements on the shared connection mid-read
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ----- users -----
+
+    def user_count(self):
+        return self._fetchall("SELECT COUNT(*) FROM users")[0][0]
+
+    def insert_user(self, username, email):
+        cursor = self._execute(
+            "INSERT OR IGNORE INTO users (username, email) VALUES (?, ?)",
+            (username, email),
+        )
+        return cursor.rowcount == 1
+
+    def update_subscription(self, username, is_premium, subscription_end, renewal_months=0):
+        self._execute(
+            "UPDATE users SET is_premium = ?, subscription_end = ?, renewal_months = ? WHERE username = ?",
+            (int(is_premium), _to_text(subscription_end), renewal_months, username),
+        )
+
+    def subscription_ends(self):
+        # (username, subscription_end) for every premium user, loaded or not
+        return [
+            (username, _to_datetime(end)) for username, end in self._fetchall(
+                "SELECT username, subscription_end FROM users WHERE is_premium AND subscription_end IS NOT NULL"
+            )
+        ]
+
+    @profiled('TaskStore.load_user')
+    def load_user(self, username):
+        rows = self._fetchall(
+            "SELECT username, email, is_premium, subscription_end, renewal_months FROM users WHERE username = ?",
+            (username,),
+        )
+        if not rows:
+            return None
+        row = rows[0]
+        user = User(row[0], row[1], bool(row[2]), _to_datetime(row[3]), store=self, renewal_months=row[4])
+        user.load_tasks(self.load_tasks(username))
+        return user
+
+    # ----- team rollups -----
+
+    # Every stored task as the event stream counts it: recurring rules only
+    # through their completed occurrences, each a completed task due on the
+    # occurrence's date
+    COUNTED_TASKS_SQL = (
+        "WITH counted AS ("
+        "SELECT username, priority, due_date, completed, completed_at FROM tasks WHERE recurrence IS NULL "
+        "UNION ALL "
+        "SELECT t.username, t.priority, o.due_date, 1, o.completed_at FROM task_occurrences o JOIN tasks t ON t.id = o.task_id) "
+    )
+
+    @profiled('TaskStore.rollup_totals')
+    def rollup_totals(self):
+        # Aggregates over every stored user for TeamRollups.seed(), so the
+        # team dashboard covers users that have not logged in since startup
+        counted = self.COUNTED_TASKS_SQL
+        with self._lock:
+            users = [(username, bool(is_premium)) for username, is_premium in self._fetchall("SELECT username, is_premium FROM users")]
+            task_counts = {
+                username: [total, completed or 0]
+                for username, total, completed in self._fetchall(counted + "SELECT username, COUNT(*), SUM(completed) FROM counted GROUP BY username")
+            }
+            completions = {
+                date.fromisoformat(day): count
+                for day, count in self._fetchall(counted + "SELECT substr(completed_at, 1, 10), COUNT(*) FROM counted WHERE completed GROUP BY 1")
+            }
+            priority_mix = {
+                TaskPriority(priority): count
+                for priority, count in self._fetchall(counted + "SELECT priority, COUNT(*) FROM counted GROUP BY priority")
+            }
+            pending = [
+                (TaskPriority(priority), date.fromisoformat(due_date), count)
+                for priority, due_date, count in self._fetchall(
+                    counted + "SELECT priority, due_date, COUNT(*) FROM counted WHERE NOT completed GROUP BY priority, due_date"
+                )
+            ]
+        return {'users': users, 'task_counts': task_counts, 'completions': completions,
+                'priority_mix': priority_mix, 'pending': pending}
+
+    # ----- tasks -----
+
+    INSERT_TASK_SQL = (
+        "INSERT INTO tasks (username, title, description, due_date, priority, completed, created_at, completed_at, recurrence) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+
+    @staticmethod
+    def _task_params(username, task):
+        return (
+            username,
+            task.title,
+            task.description,
+            task.due_date.isoformat(),
+            task.priority.value,
+            int(task.completed),
+            _to_text(task.created_at),
+            _to_text(task.completed_at),
+            task.recurrence.to_text() if task.recurrence is not None else None,
+        )
+
+    def insert_task(self, username, task):
+        cursor = self._execute(self.INSERT_TASK_SQL, self._task_params(username, task))
+        return cursor.lastrowid
+
+    def insert_tasks(self, username, tasks):
+        # One transaction for the whole batch; returns the new row ids in order
+        with self.transaction() as conn:
+            return [conn.execute(self.INSERT_TASK_SQL, self._task_params(username, task)).lastrowid for task in tasks]
+
+    def complete_task(self, task_id, completed_at):
+        self._execute(
+            "UPDATE tasks SET completed = 1, completed_at = ? WHERE id = ?",
+            (_to_text(completed_at), task_id),
+        )
+
+    def complete_occurrence(self, task_id, due_date, completed_at):
+        self._execute(
+            "INSERT OR REPLACE INTO task_occurrences (task_id, due_date, completed_at) VALUES (?, ?, ?)",
+            (task_id, due_date.isoformat(), _to_text(completed_at)),
+        )
+
+    def complete_tasks(self, completions):
+        # (task_id, completed_at) pairs, in one transaction
+        with self.transaction() as conn:
+            conn.executemany(
+                "UPDATE tasks SET completed = 1, completed_at = ? WHERE id = ?",
+                [(_to_text(completed_at), task_id) for task_id, completed_at in completions],
+            )
+
+    def update_tasks(self, task_ids, priority=None, due_date=None):
+        assignments, values = [], []
+        if priority is not None:
+            assignments.append("priority = ?")
+            values.append(priority.value)
+        if due_date is not None:
+            assignments.append("due_date = ?")
+            values.append(due_date.isoformat())
+        if not assignments:
+            return
+        with self.transaction() as conn:
+            conn.executemany(
+                f"UPDATE tasks SET {', '.join(assignments)} WHERE id = ?",
+                [(*values, task_id) for task_id in task_ids],
+            )
+
+    def delete_tasks(self, task_ids):
+        # A recurring task's completed occurrences go with it
+        params = [(task_id,) for task_id in task_ids]
+        with self.transaction() as conn:
+            conn.executemany("DELETE FROM task_occurrences WHERE task_id = ?", params)
+            conn.executemany("DELETE FROM tasks WHERE id = ?", params)
+
+    def load_tasks(self, username):
+        rows = self._fetchall(
+            "SELECT id, title, description, due_date, priority, completed, created_at, completed_at, recurrence "
+            "FROM tasks WHERE username = ? ORDER BY id",
+            (username,),
+        )
+        tasks = []
+        recurring = {}
+        for task_id, title, description, due_date, priority, completed, created_at, completed_at, recurrence in rows:
+            task = Task(title, description, date.fromisoformat(due_date), TaskPriority(priority), bool(completed))
+            task.id = task_id
+            task.created_at = _to_datetime(created_at)
+            task.completed_at = _to_datetime(completed_at)
+            if recurrence is not None:
+                task.recurrence = RecurrenceRule.from_text(recurrence)
+                recurring[task_id] = task
+            tasks.append(task)
+        if recurring:
+            for task_id, due_date, completed_at in self._fetchall(
+                "SELECT o.task_id, o.due_date, o.completed_at FROM task_occurrences o "
+                "JOIN tasks t ON t.id = o.task_id WHERE t.username = ?",
+                (username,),
+            ):
+                recurring[task_id].completed_occurrences[date.fromisoformat(due_date)] = _to_datetime(completed_at)
+        return tasks
+
+# ======================
+# SIMULATED DATABASE
+# ======================
+
+class DatabaseSimulator:
+    def __init__(self, store=None):
+        self.store = store if store is not None else TaskStore()
+        self.task_manager = TaskManager(self.store)
+        # Seed the demo accounts only into an empty database
+        if self.store.user_count() == 0:
+            with self.store.transaction():
+                self._seed()
+
+    def _seed(self):
+        # Add some dummy users
+        self.task_manager.register_user("Aqsa", "Aqsa@example.com")
+        self.task_manager.register_user("Aqsa_Gull", "AqsaGull@example.com")
+        
+        # Add some dummy tasks
+        john = self.task_manager.login_user("Aqsa")
+        if john:
+            john.add_task(Task("Complete project", "Finish the Streamlit assignment", datetime(2023, 6, 15), TaskPriority.HIGH))
+            john.add_task(Task("Buy groceries", "Milk, eggs, bread", datetime(2023, 6, 10), TaskPriority.MEDIUM))
+            john.add_task(Task("Call mom", "Wish her happy birthday", datetime(2023, 6, 12), TaskPriority.URGENT))
+            john.add_task(Task("Exercise", "30 minutes cardio", datetime(2023, 6, 11), TaskPriority.LOW, True))
+        
+        jane = self.task_manager.login_user("Aqsa_Gull")
+        if jane:
+            jane.upgrade_to_premium(3)
+            jane.add_task(Task("Prepare presentation", "Quarterly business review", datetime(2023, 6, 20), TaskPriority.HIGH))
+            jane.add_task(Task("Book flights", "Summer vacation", datetime(2023, 7, 1), TaskPriority.MEDIUM))
+            jane.add_task(Task("Renew subscription", "TaskMaster Pro", datetime(2023, 6, 30), TaskPriority.URGENT))
@@ -0,0 +1,55 @@
+import heapq
+import threading
+
+# ======================
+# SUBSCRIPTION SCHEDULER
+# ======================
+
+class SubscriptionScheduler:
+    # Min-heap of (subscription_end, username) for every premium user.
+    # Rescheduling leaves the old heap entry behind; it is recognised as
+    # stale when it surfaces (its end no longer matches self._ends) and
+    # skipped, and the heap is rebuilt once stale entries outnumber live ones. Popping the k due users costs O(k log n),
+    # independent of how many users are not due.
+    def __init__(self):
+        self._heap = []
+        self._ends = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._ends)
+
+    def schedule(self, username, subscription_end):
+        with self._lock:
+            if self._ends.get(username) == subscription_end:
+                return
+            self._ends[username] = subscription_end
+            heapq.heappush(self._heap, (subscription_end, username))
+            self._maybe_compact()
+
+    def schedule_many(self, entries):
+        # Bulk load of (username, subscription_end) pairs: one O(n) heapify
+        with self._lock:
+            self._ends.update(entries)
+            self._compact()
+
+    def pop_due(self, now, limit=None):
+        # Remove and return (username, subscription_end) for every live entry
+        # that ended at or before now, earliest first
+        due = []
+        with self._lock:
+            heap, ends = self._heap, self._ends
+            while heap and heap[0][0] <= now and (limit is None or len(due) < limit):
+                end, username = heapq.heappop(heap)
+                if ends.get(username) == end:
+                    del ends[username]
+                    due.append((username, end))
+        return due
+
+    def _maybe_compact(self):
+        if len(self._heap) > 2 * len(self._ends) + 64:
+            self._compact()
+
+    def _compact(self):
+        self._heap = [(end, username) for username, end in self._ends.items()]
+        heapq.heapify(self._heap)
@@ -0,0 +1,78 @@
+import heapq
+from bisect import bisect_left, insort
+
+# ======================
+# PENDING TASK INDEX
+# ======================
+
+class PendingTaskIndex:
+    # Pending tasks of one user, keyed by position in User.tasks.
+    # _keys is sorted by (due date ordinal, -priority, position) for range queries;
+    # _heap orders by (-priority, due date ordinal, position) for "next up" and is
+    # cleaned lazily: entries for tasks since completed or edited no longer match
+    # _live (position -> its current heap entry) and are skipped when they surface,
+    # and the heap is rebuilt once they outnumber the live ones.
+    def __init__(self):
+        self._keys = []
+        self._heap = []
+        self._live = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def add(self, position, task):
+        due = task.due_date.toordinal()
+        priority = task.priority.value
+        insort(self._keys, (due, -priority, position))
+        entry = (-priority, due, position)
+        heapq.heappush(self._heap, entry)
+        self._live[position] = entry
+
+    def remove(self, position, task):
+        key = (task.due_date.toordinal(), -task.priority.value, position)
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            del self._keys[i]
+            self._live.pop(position, None)
+            if len(self._heap) > 2 * len(self._live) + 64:
+                self._rebuild_heap()
+
+    def _rebuild_heap(self):
+        self._heap = [(neg_priority, due, position) for due, neg_priority, position in self._keys]
+        self._live = {entry[2]: entry for entry in self._heap}
+        heapq.heapify(self._heap)
+
+    def remap(self, new_positions):
+        # Positions shifted by deleting tasks: new_positions[old] is the new
+        # position. The mapping is monotonic, so _keys stays sorted.
+        self._keys = [(due, neg_priority, new_positions[position]) for due, neg_priority, position in self._keys]
+        self._rebuild_heap()
+
+    def buckets(self, today, soon_days=3):
+        # Overdue / due today / due within soon_days / later, each in (due, priority) order
+        today_ord = today.toordinal()
+        overdue = bisect_left(self._keys, (today_ord,))
+        due_today = bisect_left(self._keys, (today_ord + 1,))
+        due_soon = bisect_left(self._keys, (today_ord + soon_days + 1,))
+        return {
+            'overdue': self._keys[:overdue],
+            'today': self._keys[overdue:due_today],
+            'soon': self._keys[due_today:due_soon],
+            'later': self._keys[due_soon:],
+        }
+
+    def top(self, n):
+        # Highest priority first, earliest due date breaking ties
+        picked = []
+        while self._heap and len(picked) < n:
+            entry = heapq.heappop(self._heap)
+            # A task edited back to the same key has its old entry too; equal
+            # entries pop back to back, so keep one of them
+            if self._live.get(entry[2]) == entry and (not picked or picked[-1] != entry):
+                picked.append(entry)
+        for entry in picked:
+            heapq.heappush(self._heap, entry)
+        return [position for _, _, position in picked]
@@ -0,0 +1,245 @@
+import sys
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from .models import Task, TaskPriority, next_version
+
+# ======================
+# COLUMNAR TASK STORAGE
+# ======================
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+NO_TIMESTAMP = np.iinfo(np.int64).min
+NO_ID = -1
+ARRAY_COLUMNS = ('ids', 'due_days', 'priorities', 'completed', 'created_at', 'completed_at', 'versions')
+
+def _to_micros(moment):
+    return NO_TIMESTAMP if moment is None else (moment - EPOCH) // MICROSECOND
+
+def _from_micros(value):
+    return None if value == NO_TIMESTAMP else EPOCH + timedelta(microseconds=int(value))
+
+class TaskView:
+    # Task-like handle onto one row of a TaskTable; reads and writes go to the columns
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    @property
+    def id(self):
+        value = int(self._table.ids[self._row])
+        return None if value == NO_ID else value
+
+    @id.setter
+    def id(self, value):
+        self._table.ids[self._row] = NO_ID if value is None else value
+
+    @property
+    def title(self):
+        return self._table.titles[self._row]
+
+    @property
+    def description(self):
+        return self._table.descriptions[self._row]
+
+    @property
+    def due_date(self):
+        return date.fromordinal(int(self._table.due_days[self._row]))
+
+    @property
+    def priority(self):
+        return TaskPriority(int(self._table.priorities[self._row]))
+
+    @property
+    def completed(self):
+        return bool(self._table.completed[self._row])
+
+    @property
+    def created_at(self):
+        return _from_micros(self._table.created_at[self._row])
+
+    @property
+    def completed_at(self):
+        return _from_micros(self._table.completed_at[self._row])
+
+    @property
+    def version(self):
+        return int(self._table.versions[self._row])
+
+    def complete_task(self):
+        self._table.completed[self._row] = True
+        self._table.completed_at[self._row] = _to_micros(datetime.now())
+        self._table.versions[self._row] = next_version()
+
+    def update(self, priority=None, due_date=None):
+        if priority is not None:
+            self._table.priorities[self._row] = priority.value
+        if due_date is not None:
+            self._table.due_days[self._row] = due_date.toordinal()
+        self._table.versions[self._row] = next_version()
+
+    def __eq__(self, other):
+        return isinstance(other, TaskView) and other._table is self._table and other._row == self._row
+
+    def __hash__(self):
+        return hash((id(self._table), self._row))
+
+    def __str__(self):
+        return f"{self.title} (Due: {self.due_date.strftime('%Y-%m-%d')}, Priority: {self.priority.name})"
+
+class TaskSelection:
+    # Lazily materialized subset of a TaskTable: holds row numbers and only
+    # builds TaskViews for the rows that are actually iterated or indexed
+    __slots__ = ('table', 'rows')
+
+    def __init__(self, table, rows):
+        self.table = table
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __bool__(self):
+        return len(self.rows) > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TaskSelection(self.table, self.rows[index])
+        return TaskView(self.table, int(self.rows[index]))
+
+    def __iter__(self):
+        table = self.table
+        for row in self.rows.tolist():
+            yield TaskView(table, row)
+
+class TaskTable:
+    # Array-backed replacement for a list of Task objects. Columns grow by doubling;
+    # only the first len(self) rows are live.
+    INITIAL_CAPACITY = 64
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self._size = 0
+        self.ids = np.full(capacity, NO_ID, dtype=np.int64)
+        self.due_days = np.zeros(capacity, dtype=np.int32)
+        self.priorities = np.zeros(capacity, dtype=np.int8)
+        self.completed = np.zeros(capacity, dtype=np.bool_)
+        self.created_at = np.full(capacity, NO_TIMESTAMP, dtype=np.int64)
+        self.completed_at = np.full(capacity, NO_TIMESTAMP, dtype=np.int64)
+        self.versions = np.zeros(capacity, dtype=np.int64)
+        self.titles = []
+        self.descriptions = []
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += self._size
+        if not 0 <= row < self._size:
+            raise IndexError("task index out of range")
+        return TaskView(self, row)
+
+    def __iter__(self):
+        for row in range(self._size):
+            yield TaskView(self, row)
+
+    def _reserve(self, extra):
+        needed = self._size + extra
+        capacity = len(self.ids)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name, fill in (
+            ('ids', NO_ID),
+            ('due_days', 0),
+            ('priorities', 0),
+            ('completed', False),
+            ('created_at', NO_TIMESTAMP),
+            ('completed_at', NO_TIMESTAMP),
+            ('versions', 0),
+        ):
+            column = getattr(self, name)
+            grown = np.full(capacity, fill, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            setattr(self, name, grown)
+
+    def append(self, task):
+        self._reserve(1)
+        row = self._size
+        self.ids[row] = NO_ID if task.id is None else task.id
+        self.due_days[row] = task.due_date.toordinal()
+        self.priorities[row] = task.priority.value
+        self.completed[row] = task.completed
+        self.created_at[row] = _to_micros(task.created_at)
+        self.completed_at[row] = _to_micros(task.completed_at)
+        self.versions[row] = next_version()
+        self.titles.append(sys.intern(task.title))
+        self.descriptions.append(sys.intern(task.description))
+        self._size += 1
+
+    def extend(self, tasks):
+        for task in tasks:
+            self.append(task)
+
+    def delete_rows(self, rows):
+        # Compact the table without the given rows; later rows move up
+        keep = np.ones(self._size, dtype=np.bool_)
+        keep[list(rows)] = False
+        for name in ARRAY_COLUMNS:
+            column = getattr(self, name)
+            kept = column[:self._size][keep]
+            column[:len(kept)] = kept
+        self.titles = [title for title, kept in zip(self.titles, keep.tolist()) if kept]
+        self.descriptions = [description for description, kept in zip(self.descriptions, keep.tolist()) if kept]
+        self._size = len(self.titles)
+
+    def detach(self, rows):
+        # Task copies of the given rows, unaffected by deletes that later
+        # move them; each column is read once for all rows
+        rows = np.asarray(rows, dtype=np.intp)
+        priorities = {priority.value: priority for priority in TaskPriority}
+        tasks = []
+        for row, task_id, due_day, priority, completed, created_at, completed_at, version in zip(
+            rows.tolist(), self.ids[rows].tolist(), self.due_days[rows].tolist(), self.priorities[rows].tolist(),
+            self.completed[rows].tolist(), self.created_at[rows].tolist(), self.completed_at[rows].tolist(),
+            self.versions[rows].tolist(),
+        ):
+            task = Task(self.titles[row], self.descriptions[row], date.fromordinal(due_day), priorities[priority], completed)
+            task.id = None if task_id == NO_ID else task_id
+            task.created_at = _from_micros(created_at)
+            task.completed_at = _from_micros(completed_at)
+            task.version = version
+            tasks.append(task)
+        return tasks
+
+    def take(self, rows):
+        # A new table holding copies of the given rows, in order
+        rows = np.asarray(rows, dtype=np.intp)
+        table = TaskTable(max(len(rows), 1))
+        for name in ARRAY_COLUMNS:
+            getattr(table, name)[:len(rows)] = getattr(self, name)[rows]
+        table.titles = [self.titles[row] for row in rows.tolist()]
+        table.descriptions = [self.descriptions[row] for row in rows.tolist()]
+        table._size = len(rows)
+        return table
+
+    def column(self, name):
+        # Live (trimmed) view of one of the array columns
+        return getattr(self, name)[:self._size]
+
+    def select(self, mask):
+        return TaskSelection(self, np.flatnonzero(mask))
+
+    def completed_tasks(self):
+        return self.select(self.column('completed'))
+
+    def pending_tasks(self):
+        return self.select(~self.column('completed'))
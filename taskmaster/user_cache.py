@@ -0,0 +1,122 @@
+import threading
+import weakref
+from collections import OrderedDict
+
+# ======================
+# USER CACHE
+# ======================
+
+# Approximate resident size of a loaded user, fitted to tracemalloc
+# measurements of users with 10 to 5,000 tasks
+# (benchmarks/bench_user_cache.py checks it): a fixed part, a part per task
+# (the Task, its pending-index and id-index entries) and a part per distinct
+# search term (its postings). Small users are dominated by the last.
+USER_BYTES = 6_000
+TASK_BYTES = 1_050
+COLUMNAR_TASK_BYTES = 800
+TERM_BYTES = 256
+
+def estimate_user_bytes(user):
+    per_task = COLUMNAR_TASK_BYTES if user.columnar else TASK_BYTES
+    return (USER_BYTES + per_task * len(user._tasks) + TASK_BYTES * len(user.recurring_tasks)
+            + TERM_BYTES * len(user.search_index.postings))
+
+class UserCache:
+    # Loaded users by username, least recently used first, kept within a
+    # memory budget. Every lookup marks its user used and re-measures it;
+    # once the total is over budget, users are evicted from the least
+    # recently used end and loaded from the store again on their next
+    # lookup. A user evicted while a rerun or request still holds it is
+    # revived from a weak reference rather than loaded a second time, so an
+    # account never has two diverging User objects.
+    # budget_bytes=None never evicts (there is no store to reload from).
+    def __init__(self, budget_bytes=None):
+        self.budget_bytes = budget_bytes
+        self._users = OrderedDict()
+        self._sizes = {}
+        self._evicted = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.revivals = 0
+
+    def __len__(self):
+        return len(self._users)
+
+    def __contains__(self, username):
+        return username in self._users
+
+    def __getitem__(self, username):
+        return self._users[username]
+
+    def __setitem__(self, username, user):
+        self.put(username, user)
+
+    def get(self, username, default=None):
+        # Peek: no recency update and no counters
+        return self._users.get(username, default)
+
+    def values(self):
+        return list(self._users.values())
+
+    def items(self):
+        return list(self._users.items())
+
+    def lookup(self, username):
+        # The cached (or still referenced) user, marked most recently used;
+        # None if it has to be loaded from the store
+        with self._lock:
+            user = self._users.get(username)
+            if user is not None:
+                self.hits += 1
+                self._users.move_to_end(username)
+            else:
+                user = self._evicted.pop(username, None)
+                if user is None:
+                    return None
+                self.revivals += 1
+                self._users[username] = user
+            self._measure(username, user)
+            self._evict()
+            return user
+
+    def put(self, username, user, loaded=False):
+        # Cache a new user; loaded=True counts it as a miss (read back from
+        # the store) rather than a registration
+        with self._lock:
+            if loaded:
+                self.misses += 1
+            self._users[username] = user
+            self._users.move_to_end(username)
+            self._measure(username, user)
+            self._evict()
+
+    def _measure(self, username, user):
+        size = estimate_user_bytes(user)
+        self.total_bytes += size - self._sizes.get(username, 0)
+        self._sizes[username] = size
+
+    def _evict(self):
+        # Never the most recently used user, however large it is
+        if self.budget_bytes is None:
+            return
+        while self.total_bytes > self.budget_bytes and len(self._users) > 1:
+            username, user = self._users.popitem(last=False)
+            self.total_bytes -= self._sizes.pop(username)
+            self._evicted[username] = user
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.revivals + self.misses
+        return {
+            'users': len(self._users),
+            'estimated_mb': round(self.total_bytes / 2**20, 1),
+            'budget_mb': None if self.budget_bytes is None else round(self.budget_bytes / 2**20, 1),
+            'hits': self.hits,
+            'revivals': self.revivals,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round((self.hits + self.revivals) / lookups, 3) if lookups else None,
+        }
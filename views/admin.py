@@ -0,0 +1,64 @@
+import streamlit as st
+from datetime import date
+
+import pandas as pd
+
+from taskmaster import TaskPriority
+from views.common import get_database
+
+# ======================
+# ADMIN DASHBOARD
+# ======================
+
+DASHBOARD_DAYS = 30
+
+st.title("Team Dashboard")
+st.caption("Team productivity across every user, read from rollups seeded from the database at startup and kept up to date by the task event stream")
+
+task_manager = get_database().task_manager
+snapshot = task_manager.rollups.snapshot(today=date.today(), days=DASHBOARD_DAYS)
+
+metric_cols = st.columns(5)
+metric_cols[0].metric("Users", snapshot['users'])
+metric_cols[1].metric("Premium users", snapshot['tiers']['premium']['users'])
+metric_cols[2].metric("Tasks", snapshot['total_tasks'])
+metric_cols[3].metric("Completed", snapshot['completed_tasks'])
+metric_cols[4].metric("Overdue", snapshot['overdue_tasks'])
+
+st.subheader(f"📈 Completions per Day (last {DASHBOARD_DAYS} days)")
+completions = pd.Series(snapshot['completions_per_day'], name="Completed")
+completions.index = pd.to_datetime(completions.index)
+st.bar_chart(completions)
+
+chart_cols = st.columns(2)
+with chart_cols[0]:
+    st.subheader("🎯 Priority Mix")
+    priorities = [priority.name for priority in TaskPriority]
+    st.bar_chart(pd.DataFrame({
+        "All tasks": pd.Series(snapshot['priority_mix']).reindex(priorities, fill_value=0),
+        "Pending": pd.Series(snapshot['pending_priority_mix'], dtype="int64").reindex(priorities, fill_value=0),
+    }), stack=False)
+with chart_cols[1]:
+    st.subheader("💎 Premium vs Free")
+    tiers = pd.DataFrame(snapshot['tiers']).T
+    tiers["completion rate"] = (tiers["completed"] / tiers["tasks"].where(tiers["tasks"] > 0)).fillna(0).map("{:.0%}".format)
+    st.dataframe(tiers, width="stretch")
+
+with st.expander("User cache"):
+    # Users are evicted once over budget and reloaded on their next visit;
+    # many misses and evictions mean TASKMASTER_USER_CACHE_MB is too small
+    cache = task_manager.users.stats()
+    cache_cols = st.columns(5)
+    cache_cols[0].metric("Cached users", cache['users'])
+    budget = "unbounded" if cache['budget_mb'] is None else f"{cache['budget_mb']:g} MB"
+    cache_cols[1].metric("Estimated size", f"{cache['estimated_mb']:g} MB", help=f"Budget: {budget}")
+    cache_cols[2].metric("Hit rate", "–" if cache['hit_rate'] is None else f"{cache['hit_rate']:.1%}")
+    cache_cols[3].metric("Misses", cache['misses'], help="Users loaded from the store")
+    cache_cols[4].metric("Evictions", cache['evictions'], help=f"{cache['revivals']} evicted users were still in use and kept")
+
+with st.expander("Recent events"):
+    st.dataframe(
+        [event._asdict() | {'priority': event.priority.name if event.priority else None} for event in task_manager.events.recent(50)][::-1],
+        hide_index=True,
+        width="stretch"
+    )
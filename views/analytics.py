@@ -0,0 +1,118 @@
+import threading
+from datetime import date
+
+import streamlit as st
+
+# pandas and Plotly are imported here, on the first visit to this page,
+# rather than by every session at startup
+from taskmaster import analytics
+from taskmaster.profiling import profiled
+from views.common import BILLING_PAGE, current_user
+
+# ======================
+# ANALYTICS PAGE
+# ======================
+
+class UserAnalytics:
+    # The task frame and figures of one user for one (user.version, today).
+    # They are rebuilt only after a task is added or completed, or when the
+    # date rolls over, and a newer key drops the older frame and figures at
+    # once instead of leaving them cached. Versions never repeat, so a user
+    # reloaded after eviction starts afresh. The cached objects are shared
+    # between reruns and sessions and must be treated as read-only.
+    def __init__(self):
+        self._key = None
+        self._frame = None
+        self._figures = {}
+        self._lock = threading.RLock()
+
+    def _refresh(self, key):
+        if key != self._key:
+            self._key = key
+            self._frame = None
+            self._figures = {}
+
+    def frame(self, key, user):
+        with self._lock:
+            self._refresh(key)
+            if self._frame is None:
+                self._frame = analytics.build_task_frame(user, today=key[1])
+            return self._frame
+
+    @profiled("analytics.figure")
+    def figure(self, key, chart, user):
+        with self._lock:
+            self._refresh(key)
+            figure = self._figures.get(chart)
+            if figure is None:
+                figure = self._figures[chart] = self._build_figure(key, chart, user)
+            return figure
+
+    def _build_figure(self, key, chart, user):
+        if chart == 'completion_rate':
+            stats = user.get_stats(today=key[1])
+            return analytics.completion_rate_figure(stats['completed_tasks'], stats['pending_tasks'])
+        df = self.frame(key, user)
+        if chart == 'priority_distribution':
+            return analytics.priority_distribution_figure(df)
+        if chart == 'weekly_completions':
+            return analytics.weekly_completions_figure(df)
+        if chart == 'lead_time':
+            return analytics.lead_time_figure(df)
+        raise ValueError(f"Unknown chart: {chart}")
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def get_user_analytics(username):
+    # One slot per user, holding only its latest frame and figures
+    return UserAnalytics()
+
+user = current_user()
+st.title("Productivity Analytics")
+if not user.task_count() and not user.recurring_tasks:
+    st.info("No data to display yet. Add some tasks first!")
+else:
+    user_analytics = get_user_analytics(user.username)
+    analytics_key = (user.version, date.today())
+    df = user_analytics.frame(analytics_key, user)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Completion rate pie chart
+        if user.task_count() > 0 or user.recurring_tasks:
+            st.plotly_chart(user_analytics.figure(analytics_key, 'completion_rate', user), width="stretch")
+        else:
+            st.info("Not enough data for completion rate chart")
+
+    with col2:
+        # Priority distribution
+        if user.task_count() > 0 or user.recurring_tasks:
+            st.plotly_chart(user_analytics.figure(analytics_key, 'priority_distribution', user), width="stretch")
+        else:
+            st.info("Not enough data for priority distribution chart")
+
+    if user.is_premium:
+        st.markdown("---")
+        st.subheader("📈 Historical Trends")
+        if df['Completed'].any():
+            trend_cols = st.columns(2)
+            with trend_cols[0]:
+                st.plotly_chart(user_analytics.figure(analytics_key, 'weekly_completions', user), width="stretch")
+            with trend_cols[1]:
+                st.plotly_chart(user_analytics.figure(analytics_key, 'lead_time', user), width="stretch")
+        else:
+            st.info("Complete a few tasks to see your trends")
+
+    # Premium features section
+    if not user.is_premium:
+        st.markdown("---")
+        st.subheader("🔓 Unlock Advanced Analytics")
+        st.write("Upgrade to Premium to access:")
+        st.write("- Historical performance trends")
+        st.write("- Time spent analysis")
+        st.write("- Custom report generation")
+        st.write("- Team productivity metrics")
+
+        if st.button("Upgrade to Premium", key="upgrade_analytics"):
+            st.session_state.show_upgrade = True
+            st.switch_page(BILLING_PAGE)
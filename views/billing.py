@@ -0,0 +1,136 @@
+import streamlit as st
+import uuid
+
+from taskmaster.payments import PaymentStatus
+from taskmaster.profiling import profiler
+from views.common import current_user, get_payment_processor
+
+# ======================
+# BILLING PAGE
+# ======================
+
+@st.fragment(run_every=1)
+def payment_status_panel():
+    # Re-runs on its own every second until the payment leaves PENDING; like
+    # widget callbacks it looks the user up rather than holding it
+    with profiler.span("fragment.payment_status"):
+        processor = get_payment_processor()
+        payment_key = st.session_state.get('payment_key')
+        if payment_key is None:
+            return
+        payment = processor.get(payment_key)
+        if payment is None or payment.status is PaymentStatus.PENDING:
+            st.info("⏳ Processing payment...")
+        elif payment.status is PaymentStatus.SUCCEEDED:
+            if processor.settle(payment.key) is not None:
+                current_user().upgrade_to_premium(payment.months, auto_renew=st.session_state.get('auto_renew', False))
+            del st.session_state.payment_key
+            st.session_state.show_upgrade = False
+            st.session_state.payment_succeeded = True
+            st.rerun()
+        else:
+            # A retry gets a fresh idempotency key
+            del st.session_state.payment_key
+            st.session_state.payment_failed = True
+            st.rerun()
+
+user = current_user()
+st.title("Billing")
+
+if user.is_premium:
+    if user.renewal_months:
+        plan = "annually" if user.renewal_months == 12 else f"every {user.renewal_months} month(s)"
+        st.success(f"💎 Premium member, renews {plan} on {user.subscription_end.strftime('%Y-%m-%d')}")
+        if st.button("Cancel auto-renewal", key="cancel_renewal"):
+            user.cancel_renewal()
+            st.rerun()
+    else:
+        st.success(f"💎 Premium member until {user.subscription_end.strftime('%Y-%m-%d')}")
+
+# Premium upgrade section
+if not user.is_premium:
+    st.subheader("🚀 Upgrade to Premium")
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("""
+        ### 💎 Premium Features
+        - Unlimited projects
+        - Advanced analytics
+        - File attachments (up to 100MB)
+        - Calendar integration
+        - Priority support
+        - AI task suggestions
+        """)
+
+    with col2:
+        st.markdown("""
+        ### Pricing Plans
+        """)
+
+        plan_cols = st.columns(2)
+
+        with plan_cols[0]:
+            st.markdown("""
+            **Monthly**  
+            $5/month  
+            Cancel anytime
+            """)
+            if st.button("Choose Monthly", key="monthly_plan"):
+                st.session_state.show_upgrade = True
+                st.session_state.upgrade_months = 1
+
+        with plan_cols[1]:
+            st.markdown("""
+            **Annual (Save 20%)**  
+            $48/year ($4/month)  
+            Billed annually
+            """)
+            if st.button("Choose Annual", key="annual_plan"):
+                st.session_state.show_upgrade = True
+                st.session_state.upgrade_months = 12
+
+    st.markdown("""
+    *7-day money-back guarantee. All plans include all premium features.*
+    """)
+
+# Payment simulation
+if st.session_state.get('show_upgrade', False):
+    with st.form("payment_form"), profiler.span("form.payment"):
+        st.subheader("Upgrade to Premium")
+        st.write("Please enter your payment details")
+
+        name_on_card = st.text_input("Name on Card")
+        card_number = st.text_input("Card Number", placeholder="1234 5678 9012 3456")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            expiry_date = st.text_input("Expiry Date", placeholder="MM/YY")
+        with col2:
+            cvv = st.text_input("CVV", placeholder="123")
+
+        promo_code = st.text_input("Promo Code (optional)")
+        st.checkbox("Renew automatically when the plan ends", key="auto_renew")
+
+        if st.form_submit_button("Subscribe Now", disabled='payment_key' in st.session_state):
+            if name_on_card and card_number and expiry_date and cvv:
+                # Authorization runs on the payment executor; the status
+                # panel below polls for the outcome without blocking
+                payment_key = st.session_state.setdefault('payment_key', uuid.uuid4().hex)
+                get_payment_processor().submit(
+                    payment_key,
+                    user.username,
+                    st.session_state.get('upgrade_months', 1),
+                    {'name': name_on_card, 'number': card_number, 'expiry': expiry_date, 'cvv': cvv, 'promo_code': promo_code}
+                )
+            else:
+                st.error("Please fill in all payment details")
+
+    if 'payment_key' in st.session_state:
+        payment_status_panel()
+    elif st.session_state.pop('payment_failed', False):
+        st.error("Payment failed. Please check your card details and try again.")
+
+if st.session_state.pop('payment_succeeded', False):
+    st.success("Payment successful! You are now a Premium member.")
+    st.balloons()
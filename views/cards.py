@@ -0,0 +1,96 @@
+import html
+import threading
+
+import streamlit as st
+
+# ======================
+# BATCHED TASK CARDS
+# ======================
+
+# Cards per st.markdown element; 10k cards go out as 10 deltas instead of 10k
+CARD_CHUNK_SIZE = 1000
+MAX_CACHED_CARDS = 100_000
+
+class TaskCardCache:
+    # Per-task card HTML keyed on (kind, task.id, task.due_date, task.version)
+    # for one day at a time: due-in/overdue text depends on today, so the date
+    # rolling over (or the cache outgrowing max_entries) drops every fragment
+    # at once. Keys hold plain values rather than the Task, TaskView or
+    # Occurrence itself, so the cache pins no user's tasks, and a TaskView's
+    # row moving after a delete cannot pick up another task's card. Versions
+    # are unique process-wide; the due date tells a recurring task's
+    # occurrences apart.
+    def __init__(self, max_entries=MAX_CACHED_CARDS):
+        self.max_entries = max_entries
+        self._fragments = {}
+        self._today = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _fragment(self, kind, task, today, build):
+        if today != self._today:
+            with self._lock:
+                if today != self._today:
+                    self._fragments = {}
+                    self._today = today
+        fragments = self._fragments
+        key = (kind, task.id, task.due_date, task.version)
+        fragment = fragments.get(key)
+        if fragment is None:
+            self.misses += 1
+            if len(fragments) >= self.max_entries:
+                fragments.clear()
+            fragment = fragments[key] = build(task, today)
+        else:
+            self.hits += 1
+        return fragment
+
+    def completed_card(self, task, today):
+        return self._fragment('completed', task, today, _completed_card)
+
+    def pending_card(self, task, today):
+        return self._fragment('pending', task, today, _pending_card)
+
+def _escape(text):
+    # A blank line would end the raw HTML block, so newlines become <br>
+    return html.escape(text).replace("\r", "").replace("\n", "<br>")
+
+def _completed_card(task, today):
+    return (
+        f'<div class="task-card"><h4>✔️ {_escape(task.title)}</h4>'
+        f'<p>Completed on: {task.completed_at:%Y-%m-%d}</p></div>'
+    )
+
+def _pending_card(task, today, soon_days=3):
+    days_left = (task.due_date - today).days
+    if days_left < 0:
+        status = f"❌ Overdue by {-days_left} days"
+    elif days_left == 0:
+        status = "⚠️ Due today"
+    elif days_left <= soon_days:
+        status = f"⚠️ Due in {days_left} days"
+    else:
+        status = f"⏳ Due in {days_left} days"
+    return (
+        f'<div class="task-card"><h4>🔘 {_escape(task.title)}</h4>'
+        f'<p>Priority: {task.priority.name} | Due: {task.due_date:%Y-%m-%d} | {status}</p>'
+        f'<p>{_escape(task.description)}</p></div>'
+    )
+
+@st.cache_resource(show_spinner=False)
+def get_card_cache():
+    # Shared by every session; fragments hold no per-session state
+    return TaskCardCache()
+
+def render_cards(fragments, chunk_size=CARD_CHUNK_SIZE):
+    # Fragments are single-line HTML with no blank lines, so each chunk stays
+    # one raw HTML block and Markdown never reinterprets the task text
+    chunk = []
+    for fragment in fragments:
+        chunk.append(fragment)
+        if len(chunk) == chunk_size:
+            st.markdown("".join(chunk), unsafe_allow_html=True)
+            chunk = []
+    if chunk:
+        st.markdown("".join(chunk), unsafe_allow_html=True)
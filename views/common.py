@@ -0,0 +1,55 @@
+import logging
+import os
+
+import streamlit as st
+
+from taskmaster import DatabaseSimulator
+from taskmaster.payments import PaymentProcessor
+
+# ======================
+# SHARED PAGE STATE
+# ======================
+
+# Page scripts, loaded by st.navigation only when their page is opened
+LANDING_PAGE = "views/landing.py"
+TASKS_PAGE = "views/tasks.py"
+ANALYTICS_PAGE = "views/analytics.py"
+BILLING_PAGE = "views/billing.py"
+ADMIN_PAGE = "views/admin.py"
+
+@st.cache_resource(show_spinner=False)
+def get_database():
+    # Created once per process and shared by every rerun and session
+    return DatabaseSimulator()
+
+def current_user():
+    # Session state holds only the username. The User lives in the shared
+    # TaskManager cache, which may have evicted it while the tab sat idle;
+    # login_user() then reloads it from the store.
+    username = st.session_state.get("logged_in_username")
+    if username is None:
+        return None
+    return get_database().task_manager.login_user(username)
+
+@st.cache_resource(show_spinner=False)
+def get_payment_processor():
+    return PaymentProcessor()
+
+@st.cache_resource(show_spinner=False)
+def get_api_server():
+    # The JSON API (taskmaster.api) on its own thread, sharing this process's
+    # TaskManager; only started when TASKMASTER_API_PORT is set. A port that
+    # cannot be bound is logged once and the app runs without the API:
+    # cache_resource does not cache exceptions, so raising would retry (and
+    # fail) on every rerun of every page.
+    port = os.environ.get("TASKMASTER_API_PORT")
+    if not port:
+        return None
+    from taskmaster.api import DEFAULT_HOST, start_in_thread
+
+    host = os.environ.get("TASKMASTER_API_HOST", DEFAULT_HOST)
+    try:
+        return start_in_thread(get_database().task_manager, host, int(port), os.environ.get("TASKMASTER_API_TOKEN"))
+    except OSError as exc:
+        logging.getLogger(__name__).error("JSON API not started on %s:%s: %s", host, port, exc)
+        return None
@@ -0,0 +1,62 @@
+import streamlit as st
+
+# ======================
+# LANDING PAGE
+# ======================
+
+st.title("Boost Your Productivity with TaskMaster Pro")
+st.subheader("The ultimate task management solution")
+
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    st.markdown("""
+    ### 🚀 Key Features
+    - AI-powered task prioritization
+    - Cross-device synchronization
+    - Team collaboration tools
+    - Time tracking and analytics
+    - Customizable workflows
+    """)
+
+with col2:
+    st.markdown("""
+    ### 💎 Premium Benefits
+    - Unlimited projects
+    - Advanced analytics
+    - Priority support
+    - File attachments
+    - Calendar integration
+    """)
+
+with col3:
+    st.markdown("""
+    ### 📈 Business Solutions
+    - Team management
+    - Admin controls
+    - Productivity reports
+    - API access
+    - Dedicated account manager
+    """)
+
+st.markdown("---")
+st.subheader("Ready to get started?")
+st.write("Login or create an account from the sidebar to begin organizing your tasks!")
+
+# Testimonials
+st.markdown("""
+## What Our Users Say
+""")
+testimonial_cols = st.columns(2)
+with testimonial_cols[0]:
+    st.markdown("""
+    > "TaskMaster Pro has transformed how I organize my work. The AI prioritization saves me hours every week!"
+    >
+    > **— Sarah J., Marketing Director**
+    """)
+with testimonial_cols[1]:
+    st.markdown("""
+    > "As a freelancer, I need to stay on top of multiple projects. This app keeps me organized and productive."
+    >
+    > **— Michael T., Graphic Designer**
+    """)
@@ -0,0 +1,310 @@
+import heapq
+import streamlit as st
+from datetime import date, timedelta
+
+from taskmaster import RecurrenceRule, Task, TaskPriority, bulk_io
+from taskmaster.profiling import profiler
+from views.cards import get_card_cache, render_cards
+from views.common import current_user, get_database
+
+# ======================
+# TASKS PAGE
+# ======================
+
+TASK_TABS = ["📋 All Tasks", "✅ Completed", "⏳ Pending"]
+TASK_STATUS_FILTERS = {"All": None, "Pending": "pending", "Completed": "completed"}
+TASK_SORT_OPTIONS = {"Date added": None, "Due date": "due_date", "Priority": "priority"}
+TASK_PAGE_SIZES = [10, 25, 50, 100]
+REPEAT_OPTIONS = {"Never": None, "Daily": "daily", "Weekly": "weekly", "Monthly": "monthly"}
+BULK_ACTIONS = ["Mark complete", "Set priority", "Reschedule", "Delete"]
+EXPORT_MIME_TYPES = {"csv": "text/csv", "jsonl": "application/x-ndjson", "parquet": "application/vnd.apache.parquet"}
+
+def reset_task_page():
+    st.session_state.all_tasks_page = 0
+
+def change_task_page(step):
+    st.session_state.all_tasks_page = st.session_state.get('all_tasks_page', 0) + step
+
+# Callbacks take ids, not the User: widget callbacks and their arguments
+# live as long as the tab does, and would pin an idle user in memory
+
+def complete_task(task_id):
+    # Task ids are stable, so a click still hits its task after other
+    # sessions add or delete tasks; it only fails if the task itself is gone
+    if current_user().complete_task(task_id):
+        st.toast("Task marked as complete!")
+    else:
+        st.toast("This task was deleted in another session.")
+
+def export_tasks(username, export_format):
+    # Download callback: looks the user up when clicked rather than holding
+    # the User for as long as the button is on the page
+    user = get_database().task_manager.login_user(username)
+    return b"".join(bulk_io.export_tasks(user, export_format))
+
+def select_tasks(task_ids, selected):
+    for task_id in task_ids:
+        st.session_state[f"select_{task_id}"] = selected
+
+def apply_bulk_action(task_ids):
+    # One batched User call for the whole selection; the rerun that follows
+    # the click is the only re-render
+    user = current_user()
+    action = st.session_state.bulk_action
+    if action == "Mark complete":
+        applied = user.complete_tasks(task_ids)
+    elif action == "Set priority":
+        applied = user.update_tasks(task_ids, priority=TaskPriority[st.session_state.bulk_priority])
+    elif action == "Reschedule":
+        applied = user.update_tasks(task_ids, due_date=st.session_state.bulk_due_date)
+    else:
+        applied = user.delete_tasks(task_ids)
+    select_tasks(task_ids, False)
+    if applied:
+        st.toast(f"{action}: {len(task_ids)} task(s) updated")
+    else:
+        st.toast("Some selected tasks were deleted in another session. Please try again.")
+
+def delete_recurring_task(task_id):
+    if current_user().delete_tasks([task_id]):
+        st.toast("Recurring task deleted")
+    else:
+        st.toast("This task was already deleted in another session.")
+
+def complete_occurrence(task_id, due_date):
+    if current_user().complete_occurrence(task_id, due_date):
+        st.toast(f"Marked done for {due_date:%Y-%m-%d}!")
+    else:
+        st.toast("That occurrence was already marked done.")
+
+user = current_user()
+st.title(f"Your Tasks, {user.username}")
+
+# Task management tabs
+# Keyed tabs track the selection, so only the open tab's content is built.
+# app.py carries the All Tasks filters over while their tab or page is closed.
+tab1, tab2, tab3 = st.tabs(TASK_TABS, key="task_tabs", on_change="rerun")
+
+with tab1, profiler.span("tab.all_tasks"):
+    if tab1.open:
+        st.subheader("All Tasks")
+        if not user.task_count():
+            if not user.recurring_tasks:
+                st.info("You don't have any tasks yet. Add one below!")
+        else:
+            search_query = st.text_input("🔍 Search tasks", key="all_tasks_search", placeholder="Search titles and descriptions", on_change=reset_task_page)
+            filter_cols = st.columns(4)
+            with filter_cols[0]:
+                status_filter = st.selectbox("Status", list(TASK_STATUS_FILTERS), key="all_tasks_status", on_change=reset_task_page)
+            with filter_cols[1]:
+                priority_filter = st.selectbox("Priority", ["All"] + [p.name for p in TaskPriority], key="all_tasks_priority", on_change=reset_task_page)
+            with filter_cols[2]:
+                sort_by = st.selectbox("Sort by", list(TASK_SORT_OPTIONS), key="all_tasks_sort", on_change=reset_task_page)
+            with filter_cols[3]:
+                st.session_state.setdefault("all_tasks_page_size", TASK_PAGE_SIZES[1])
+                page_size = st.selectbox("Per page", TASK_PAGE_SIZES, key="all_tasks_page_size", on_change=reset_task_page)
+
+            # Only the visible page of the (cached) filtered/sorted index list
+            # is rendered. Its positions are resolved to tasks under the
+            # user's lock, before another session's delete can shift them.
+            status = TASK_STATUS_FILTERS[status_filter]
+            priority_choice = None if priority_filter == "All" else TaskPriority[priority_filter]
+            with user.lock:
+                if search_query.strip():
+                    # Search results are ranked by relevance
+                    task_indices = user.search_tasks(search_query, status=status, priority=priority_choice)
+                else:
+                    task_indices = user.find_tasks(status=status, priority=priority_choice, sort_by=TASK_SORT_OPTIONS[sort_by])
+                match_count = len(task_indices)
+                page_count = max(1, -(-match_count // page_size))
+                page = min(st.session_state.get('all_tasks_page', 0), page_count - 1)
+                page_tasks = user.tasks_at(task_indices[page * page_size:(page + 1) * page_size])
+            st.session_state.all_tasks_page = page
+
+            if not match_count:
+                st.info("No tasks match these filters")
+            # Widgets are keyed by task id, so their state follows the task
+            # across reruns, inserts and deletes
+            page_ids = [task.id for task in page_tasks]
+            selected = [task_id for task_id in page_ids if st.session_state.get(f"select_{task_id}")]
+            if page_tasks:
+                bulk_cols = st.columns([2, 2, 2, 1, 1])
+                with bulk_cols[0]:
+                    bulk_action = st.selectbox("Bulk action", BULK_ACTIONS, key="bulk_action")
+                with bulk_cols[1]:
+                    if bulk_action == "Set priority":
+                        st.selectbox("New priority", [p.name for p in TaskPriority], key="bulk_priority")
+                    elif bulk_action == "Reschedule":
+                        st.date_input("New due date", key="bulk_due_date")
+                with bulk_cols[2]:
+                    st.button(f"Apply to {len(selected)} selected", key="bulk_apply", disabled=not selected,
+                              on_click=apply_bulk_action, args=(selected,))
+                with bulk_cols[3]:
+                    st.button("Select page", key="bulk_select_all", on_click=select_tasks, args=(page_ids, True))
+                with bulk_cols[4]:
+                    st.button("Clear", key="bulk_clear", disabled=not selected, on_click=select_tasks, args=(page_ids, False))
+            for task in page_tasks:
+                select_col, task_col = st.columns([1, 24])
+                select_col.checkbox("Select", key=f"select_{task.id}", label_visibility="collapsed")
+                with task_col.expander(f"{'✔️' if task.completed else '🔘'} {task.title}"):
+                    col1, col2 = st.columns([3, 1])
+                    with col1:
+                        st.write(f"**Description:** {task.description}")
+                        st.write(f"**Due Date:** {task.due_date.strftime('%Y-%m-%d')}")
+                        st.write(f"**Priority:** {task.priority.name}")
+                        if task.completed:
+                            st.write(f"**Completed on:** {task.completed_at.strftime('%Y-%m-%d')}")
+                        else:
+                            st.button("Mark Complete", key=f"complete_{task.id}", on_click=complete_task, args=(task.id,))
+                    with col2:
+                        current_date = date.today()
+                        days_left = (task.due_date - current_date).days
+
+                        if not task.completed:
+                            if days_left < 0:
+                                st.error(f"Overdue by {-days_left} days")
+                            elif days_left == 0:
+                                st.warning("Due today")
+                            elif days_left <= 3:
+                                st.warning(f"Due in {days_left} days")
+                            else:
+                                st.info(f"Due in {days_left} days")
+
+            if page_count > 1:
+                nav_cols = st.columns([1, 2, 1])
+                with nav_cols[0]:
+                    st.button("◀ Previous", key="all_tasks_prev", disabled=page == 0, on_click=change_task_page, args=(-1,))
+                with nav_cols[1]:
+                    st.write(f"Page {page + 1} of {page_count} ({match_count} tasks)")
+                with nav_cols[2]:
+                    st.button("Next ▶", key="all_tasks_next", disabled=page >= page_count - 1, on_click=change_task_page, args=(1,))
+
+        if user.recurring_tasks:
+            st.markdown("**🔁 Recurring Tasks**")
+            # Only the lookback window up to today is expanded per rule
+            today = date.today()
+            window_start = today - timedelta(days=user.recurring_lookback_days)
+            for task in list(user.recurring_tasks):
+                due = [
+                    day for day in task.recurrence.occurrences(task.due_date, window_start, today + timedelta(days=1))
+                    if day not in task.completed_occurrences
+                ]
+                upcoming = next(task.recurrence.occurrences(task.due_date, today + timedelta(days=1), date.max), None)
+                with st.expander(f"{'🔁' if due else '✔️'} {task.title} ({task.recurrence})"):
+                    st.write(f"**Description:** {task.description}")
+                    st.write(f"**Priority:** {task.priority.name}")
+                    st.write(f"**Done:** {len(task.completed_occurrences)} times"
+                             + (f" · **Next:** {upcoming:%Y-%m-%d}" if upcoming else ""))
+                    for day in due:
+                        label = "Done for today" if day == today else f"Done for {day:%Y-%m-%d} (overdue)"
+                        st.button(label, key=f"complete_occurrence_{task.id}_{day:%Y%m%d}", on_click=complete_occurrence, args=(task.id, day))
+                    st.button("Delete", key=f"delete_recurring_{task.id}", help="Deletes the rule and its history",
+                              on_click=delete_recurring_task, args=(task.id,))
+
+with tab2, profiler.span("tab.completed"):
+    if tab2.open:
+        st.subheader("Completed Tasks")
+        completed_tasks = user.get_completed_tasks()
+        completed_occurrences = user.get_completed_occurrences()
+        if not completed_tasks and not completed_occurrences:
+            st.info("No completed tasks yet")
+        else:
+            # One pass over memoized fragments, emitted as a few large elements
+            card_cache = get_card_cache()
+            today = date.today()
+            render_cards(card_cache.completed_card(task, today) for tasks in (completed_tasks, completed_occurrences) for task in tasks)
+
+with tab3, profiler.span("tab.pending"):
+    if tab3.open:
+        st.subheader("Pending Tasks")
+        today = date.today()
+        occurrences = user.get_pending_occurrences(today)
+        if not len(user.pending_index) and not occurrences:
+            st.info("No pending tasks - great job!")
+        else:
+            next_up = user.get_next_up(3)
+            if next_up:
+                st.write("🎯 **Next up:** " + " · ".join(f"{task.title} ({task.priority.name})" for task in next_up))
+
+            card_cache = get_card_cache()
+            with user.lock:
+                buckets = user.get_due_buckets(today)
+                pending = user.tasks_at(
+                    position
+                    for bucket in ('overdue', 'today', 'soon', 'later')
+                    for _, _, position in buckets[bucket]
+                )
+            if occurrences:
+                # Open occurrences in the recurring window slot into the same (due date, priority) order
+                pending = heapq.merge(pending, occurrences, key=lambda task: (task.due_date, -task.priority.value))
+            render_cards(card_cache.pending_card(task, today) for task in pending)
+
+with st.expander("➕ Add New Task"), profiler.span("form.add_task"):
+    with st.form("add_task_form"):
+        title = st.text_input("Task Title", max_chars=100)
+        description = st.text_area("Description")
+        due_date = st.date_input("Due Date", min_value=date.today())
+        priority = st.selectbox(
+            "Priority",
+            options=[p.name for p in TaskPriority],
+            index=1
+        )
+        repeat_cols = st.columns(3)
+        with repeat_cols[0]:
+            repeat = st.selectbox("Repeat", list(REPEAT_OPTIONS))
+        with repeat_cols[1]:
+            repeat_every = st.number_input("Every", min_value=1, max_value=365, value=1, help="Days, weeks or months between occurrences")
+        with repeat_cols[2]:
+            repeat_until = st.date_input("Until (optional)", value=None, min_value=date.today())
+
+        if st.form_submit_button("Add Task"):
+            if title:
+                priority_enum = TaskPriority[priority]
+                frequency = REPEAT_OPTIONS[repeat]
+                new_task = Task(
+                    title=title,
+                    description=description,
+                    due_date=due_date,
+                    priority=priority_enum,
+                    recurrence=RecurrenceRule(frequency, repeat_every, repeat_until) if frequency else None
+                )
+                user.add_task(new_task)
+                st.toast("Task added successfully!")
+                st.rerun()
+            else:
+                st.error("Please enter a task title")
+
+with st.expander("📦 Import / Export Tasks"), profiler.span("form.import_export"):
+    import_col, export_col = st.columns(2)
+    with import_col:
+        st.markdown("**Import**")
+        upload = st.file_uploader("CSV, JSONL or Parquet file", type=list(bulk_io.FORMATS), key="import_file")
+        st.caption("Columns: title, description, due_date, priority, completed (optional: created_at, completed_at)")
+        if upload is not None and st.button("Import Tasks", key="import_tasks"):
+            progress_bar = st.progress(0.0, text="Importing tasks...")
+            result = bulk_io.import_tasks(
+                user,
+                upload,
+                upload.name.rsplit('.', 1)[-1].lower(),
+                progress=lambda fraction: progress_bar.progress(fraction, text=f"Importing tasks... {fraction:.0%}")
+            )
+            st.toast(f"Imported {result.imported} tasks")
+            st.session_state.import_errors = result.errors
+            st.rerun()
+        import_errors = st.session_state.pop('import_errors', None)
+        if import_errors:
+            st.warning(f"Skipped {len(import_errors)} invalid rows")
+            st.write("\n".join(f"- Row {row}: {message}" for row, message in import_errors[:10]))
+    with export_col:
+        st.markdown("**Export**")
+        export_format = st.selectbox("Format", bulk_io.FORMATS, key="export_format")
+        # Generated on click, off the script thread. export_tasks() yields
+        # chunks, but st.download_button needs the whole file, so the
+        # download is still built in memory in one piece
+        st.download_button(
+            "Download Tasks",
+            data=lambda username=user.username: export_tasks(username, export_format),
+            file_name=f"{user.username}_tasks.{export_format}",
+            mime=EXPORT_MIME_TYPES[export_format],
+            key="export_tasks"
+        )